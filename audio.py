@@ -0,0 +1,190 @@
+import io
+import os
+import queue
+import sys
+import threading
+import time
+import wave
+
+DEFAULT_SOUND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "notification.mp3")
+
+try:
+    import miniaudio
+except ImportError:
+    miniaudio = None
+
+
+class Sound:
+    # Sonido decodificado una sola vez a PCM de 16 bits en memoria
+    def __init__(self, samples, nchannels, sample_rate):
+        self.samples = samples
+        self.nchannels = nchannels
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self):
+        return len(self.samples) / 2 / self.nchannels / self.sample_rate
+
+    def to_wav(self):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(self.nchannels)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(self.samples)
+        return buffer.getvalue()
+
+
+def decode(path):
+    # Devuelve None si no hay decodificador o el archivo no es audio válido
+    if miniaudio is None:
+        return None
+    try:
+        decoded = miniaudio.decode_file(path, output_format=miniaudio.SampleFormat.SIGNED16)
+    except (miniaudio.MiniaudioError, OSError):
+        return None
+    return Sound(decoded.samples.tobytes(), decoded.nchannels, decoded.sample_rate)
+
+
+class NullBackend:
+    # No reproduce nada (equipos sin audio o pruebas)
+    def prepare(self, sound):
+        pass
+
+    def play(self, sound):
+        pass
+
+    def close(self):
+        pass
+
+
+class BellBackend(NullBackend):
+    # Sin sonido decodificado ni reproductor nativo: la campana de la ventana
+    # (`ring`) o, si no hay, la de la terminal
+    def __init__(self, ring=None):
+        self.ring = ring
+
+    def play(self, sound):
+        if self.ring is not None:
+            self.ring()
+        elif sys.stdout is not None:
+            sys.stdout.write("\a")
+            sys.stdout.flush()
+
+
+class MiniaudioBackend(NullBackend):
+    def __init__(self, fallback=None):
+        self.device = None
+        self.fallback = fallback or NullBackend()
+
+    def prepare(self, sound):
+        if sound is not None:
+            try:
+                self.device = miniaudio.PlaybackDevice(
+                    output_format=miniaudio.SampleFormat.SIGNED16,
+                    nchannels=sound.nchannels,
+                    sample_rate=sound.sample_rate
+                )
+            except miniaudio.MiniaudioError:
+                self.device = None  # Sin dispositivo de salida
+
+    def play(self, sound):
+        if sound is None or self.device is None:
+            # El MP3 no se pudo decodificar o no hay dispositivo
+            self.fallback.play(sound)
+            return
+        stream = self._stream(sound)
+        next(stream)
+        self.device.start(stream)
+        time.sleep(sound.duration)
+        self.device.stop()
+
+    def _stream(self, sound):
+        frame_size = 2 * sound.nchannels
+        position = 0
+        required_frames = yield b""
+        while position < len(sound.samples):
+            end = position + required_frames * frame_size
+            chunk = sound.samples[position:end]
+            position = end
+            required_frames = yield chunk
+
+    def close(self):
+        if self.device is not None:
+            self.device.close()
+            self.device = None
+
+
+class WinsoundBackend(NullBackend):
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+        self.wav = None
+
+    def prepare(self, sound):
+        if sound is not None:
+            self.wav = sound.to_wav()
+
+    def play(self, sound):
+        if self.wav is not None:
+            self.winsound.PlaySound(self.wav, self.winsound.SND_MEMORY)
+        else:
+            # Sin decodificador de MP3 se usa el sonido del sistema
+            self.winsound.MessageBeep(self.winsound.MB_ICONEXCLAMATION)
+
+
+def default_backend(ring=None):
+    fallback = BellBackend(ring)
+    if miniaudio is not None:
+        return MiniaudioBackend(fallback)
+    if sys.platform.startswith("win"):
+        return WinsoundBackend()
+    return fallback
+
+
+class AudioPlayer:
+    # Un único hilo de larga duración reproduce las alertas en orden. El
+    # sonido se decodifica una vez al iniciar; si se acumulan alertas, las que
+    # no caben en la cola se descartan en lugar de crear más hilos.
+
+    def __init__(self, backend=None, path=DEFAULT_SOUND, max_pending=2, ring=None):
+        # `ring` hace sonar la campana si no hay cómo reproducir el sonido;
+        # se llama desde el hilo de audio
+        self.backend = backend if backend is not None else default_backend(ring)
+        self.path = path
+        self.sound = None
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def play(self):
+        try:
+            self.queue.put_nowait("play")
+        except queue.Full:
+            pass
+
+    def close(self):
+        if self.thread is not None:
+            try:
+                self.queue.put("stop", timeout=1)
+            except queue.Full:
+                pass  # El hilo es daemon: si está bloqueado, termina con el proceso
+            self.thread.join(timeout=1)
+            self.thread = None
+
+    def _run(self):
+        self.sound = decode(self.path)
+        self.backend.prepare(self.sound)
+        while True:
+            command = self.queue.get()
+            if command == "stop":
+                break
+            try:
+                self.backend.play(self.sound)
+            except Exception:
+                pass  # Si hay error al reproducir el sonido, lo ignoramos
+        self.backend.close()
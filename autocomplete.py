@@ -0,0 +1,116 @@
+import tkinter as tk
+
+import customtkinter as ctk
+
+MAX_SUGGESTIONS = 5
+
+
+class SubjectSuggestions:
+    # Lista de sugerencias bajo el campo de materia, alimentada por el
+    # TaskRegistry del historial. Los botones se crean una vez y se
+    # reutilizan. Flechas para elegir, Tab o Enter para aceptar, Escape para
+    # cerrar; un clic también acepta.
+
+    def __init__(self, entry, registry, theme, on_pick, font_family="Helvetica", limit=MAX_SUGGESTIONS):
+        self.entry = entry
+        self.registry = registry
+        self.theme = theme
+        self.on_pick = on_pick
+        self.font_family = font_family
+        self.limit = limit
+        self.names = []
+        self.selected = 0
+        self.lookups = 0
+        self.dismissed = None     # texto con el que se cerró la lista con Escape
+        self.container = ctk.CTkFrame(entry.winfo_toplevel(), corner_radius=8, border_width=1)
+        self.theme.register(self.container, "toast")
+        self.buttons = []
+        entry.bind("<Down>", lambda event: self.move(1))
+        entry.bind("<Up>", lambda event: self.move(-1))
+        entry.bind("<Tab>", self.on_accept_key)
+        entry.bind("<Return>", self.on_accept_key)
+        entry.bind("<Escape>", self.dismiss)
+        # Al perder el foco se espera un poco: el clic en una sugerencia llega después
+        entry.bind("<FocusOut>", lambda event: entry.after(150, self.hide))
+
+    def _button(self, index):
+        while len(self.buttons) <= index:
+            button = ctk.CTkButton(
+                self.container, text="", anchor="w", height=28, corner_radius=6,
+                font=(self.font_family, 13),
+                command=lambda i=len(self.buttons): self.accept(i)
+            )
+            self.theme.register(button, "suggestion")
+            self.buttons.append(button)
+        return self.buttons[index]
+
+    def update(self, text):
+        # Tras Escape la lista sigue cerrada (el KeyRelease de Escape y el de
+        # las flechas también llegan acá) hasta que cambie el texto
+        if text == self.dismissed:
+            return
+        self.dismissed = None
+        names = []   # Con el campo vacío no se sugiere nada hasta escribir
+        if text.strip():
+            self.lookups += 1
+            names = [name for name in self.registry.complete(text, self.limit) if name != text.strip()]
+        if names == self.names:
+            return
+        self.names = names
+        self.selected = 0
+        self.render()
+
+    def render(self):
+        palette = self.theme.palette()
+        for index, name in enumerate(self.names):
+            button = self._button(index)
+            style = "button" if index == self.selected else "suggestion"
+            button.configure(text=name, **palette[style])
+            if not button.winfo_manager():
+                button.pack(fill="x", padx=4, pady=2)
+        for button in self.buttons[len(self.names):]:
+            button.pack_forget()
+        if self.names:
+            self.container.place(in_=self.entry, relx=0, rely=1.0, y=4, relwidth=1.0)
+            self.container.lift()
+        else:
+            self.container.place_forget()
+
+    def move(self, step):
+        if self.names:
+            self.selected = (self.selected + step) % len(self.names)
+            self.render()
+        return "break"
+
+    def on_accept_key(self, event):
+        if not self.names:
+            return None   # Sin sugerencias, Tab y Enter hacen lo de siempre
+        self.accept(self.selected)
+        return "break"
+
+    def accept(self, index):
+        if index >= len(self.names):
+            return
+        name = self.names[index]
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, name)
+        # on_pick vuelve a pasar por update(): no reabrir la lista con los
+        # nombres más largos ("JIRA-12" sugiere "JIRA-123")
+        self.dismissed = name
+        self.hide()
+        self.on_pick()
+
+    def dismiss(self, event=None):
+        self.dismissed = self.entry.get()
+        self.hide()
+
+    def hide(self):
+        if self.names:
+            self.names = []
+            self.render()
+
+    def destroy(self):
+        for button in self.buttons:
+            self.theme.unregister(button)
+        self.theme.unregister(self.container)
+        self.container.destroy()
@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import SessionPool
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def bench_virtual(timers, hours):
+    # Simula `hours` horas de ciclos de 25/5 minutos con un reloj virtual:
+    # mide el costo puro del montículo y de los cambios de fase
+    clock = VirtualClock()
+    pool = SessionPool(clock=clock)
+    rng = random.Random(1)
+    for i in range(timers):
+        pool.add(i, work_time=25, break_time=5)
+    for i in range(timers):
+        clock.now = rng.uniform(0, 60)
+        pool.start(i)
+    clock.now = 0.0
+
+    end = hours * 3600
+    phases = 0
+    started = time.perf_counter()
+    while True:
+        deadline = pool.scheduler.next_deadline()
+        if deadline is None or deadline > end:
+            break
+        clock.now = deadline
+        phases += pool.run_due(deadline)
+    elapsed = time.perf_counter() - started
+    return {
+        "timers": timers,
+        "simulated_hours": hours,
+        "phase_changes": phases,
+        "seconds": elapsed,
+        "phase_changes_per_second": phases / elapsed if elapsed else None
+    }
+
+
+def bench_realtime(timers, seconds, work_seconds):
+    # Temporizadores reales con fases cortas: mide CPU y despertares del bucle
+    pool = SessionPool()
+    minutes = work_seconds / 60
+    for i in range(timers):
+        pool.add(i, work_time=minutes, break_time=minutes)
+    thread = threading.Thread(target=pool.run, daemon=True)
+    thread.start()
+    for i in range(timers):
+        pool.start(i)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    pool.stop()
+    thread.join()
+    completed = sum(session.sessions_completed for session in pool.sessions.values())
+    return {
+        "timers": timers,
+        "seconds": wall,
+        "phase_seconds": work_seconds,
+        "cpu_seconds": cpu,
+        "cpu_percent": 100 * cpu / wall,
+        "wakeups": pool.wakeups,
+        "sessions_completed": completed
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del planificador de múltiples temporizadores")
+    parser.add_argument("--timers", type=int, default=10000)
+    parser.add_argument("--hours", type=float, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--phase-seconds", type=float, default=30,
+                        help="duración de cada fase en la prueba en tiempo real")
+    parser.add_argument("--output", default=None, help="archivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    results = {
+        "virtual": bench_virtual(args.timers, args.hours),
+        "realtime": bench_realtime(args.timers, args.seconds, args.phase_seconds)
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def use_stub(mode):
+    # Sin pantalla (o con --stub) se reemplazan las piezas de Tk
+    if mode == "stub":
+        return True
+    if mode == "tk":
+        return False
+    return sys.platform.startswith("linux") and not os.environ.get("DISPLAY")
+
+
+def measure(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = time.perf_counter() - start
+    return {"iterations": repeat, "total_s": elapsed, "per_call_us": elapsed / repeat * 1e6}
+
+
+def synthetic_fonts(count, seed=1):
+    rng = random.Random(seed)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))).title()
+             for _ in range(400)]
+    fonts = set()
+    while len(fonts) < count:
+        fonts.add(" ".join(rng.sample(words, rng.randint(1, 3))))
+    return sorted(fonts)
+
+
+def bench_format_time(app, repeat):
+    result = measure(lambda: app.format_time(1499), repeat)
+    result["calls_per_s"] = repeat / result["total_s"]
+    return result
+
+
+def bench_tick(app, scheduler, repeat):
+    # Un tick completo: poll de la sesión, render del temporizador principal
+    # y del flotante y el flush del cuadro. El programador virtual salta
+    # directo al próximo tick.
+    app.toggle_float_window()
+    app.session.reset(10000)
+    app.session.start()
+    app.root.update_idletasks()
+
+    def tick():
+        scheduler.run_next()
+        app.root.update_idletasks()
+
+    result = measure(tick, repeat)
+    app.session.pause()
+    app.toggle_float_window()
+    return result
+
+
+def bench_apply_colors(app, repeat):
+    colors = app.settings["custom_colors"]
+    palettes = [dict(colors, accent=f"#{i:06X}") for i in range(8)]
+    state = {"i": 0}
+
+    def apply():
+        state["i"] += 1
+        app.settings["custom_colors"] = palettes[state["i"] % len(palettes)]
+        app.apply_colors()
+        app.root.update_idletasks()
+
+    result = measure(apply, repeat)
+    result["registered_widgets"] = len(app.theme.widgets)
+    app.settings["custom_colors"] = colors
+    return result
+
+
+def bench_font_search(app, fonts, repeat):
+    app.font_catalog.fonts = fonts
+    app.font_catalog.ready = True
+    app.font_catalog.needs_refresh = False
+    app.open_settings_window()
+    window = app.settings_window
+    window.show_font_list()
+    queries = ["a", "ar", "ari", "sans", "mon", "xyz", "b", "ti", "tim"]
+    state = {"i": 0}
+
+    def search():
+        state["i"] += 1
+        window.search_var.value = queries[state["i"] % len(queries)]
+        window.update_filtered_list()
+
+    start = time.perf_counter()
+    app.font_index = None
+    app.get_font_index()
+    index_build = time.perf_counter() - start
+    result = measure(search, repeat)
+    result["fonts"] = len(fonts)
+    result["index_build_s"] = index_build
+    window.hide()
+    return result
+
+
+def bench_settings_io(app, events, repeat):
+    # save_settings (snapshot) y load_settings (snapshot + cola del registro)
+    for i in range(events):
+        app.history.record({"type": "complete", "phase": "work",
+                            "ts": f"2026-01-{1 + i % 28:02d}T10:00:00", "minutes": 25})
+    app.history.log.flush()
+
+    def save():
+        app.save_settings()
+        app.history.log.flush()
+
+    save_result = measure(save, repeat)
+    load_result = measure(app.load_settings, repeat)
+    return {"save_settings": save_result, "load_settings": load_result, "events": events}
+
+
+def bench_cold_start(stub, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        command = [sys.executable, os.path.abspath(__file__), "--cold-start-child"]
+        if stub:
+            command.append("--stub")
+        directory = tempfile.mkdtemp()
+        env = dict(os.environ, POMODORO_CONFIG_DIR=directory)
+        subprocess.run(command, check=True, cwd=directory, env=env)
+        times.append(time.perf_counter() - start)
+    return {"runs": runs, "min_s": min(times), "mean_s": sum(times) / len(times)}
+
+
+def cold_start_child(stub):
+    if stub:
+        import tk_stub
+        tk_stub.install()
+    import pomodoro
+    app = pomodoro.PomodoroApp()
+    app.root.update()
+    app.on_close()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas críticas de la app")
+    parser.add_argument("--stub", dest="mode", action="store_const", const="stub",
+                        help="reemplazar customtkinter por sustitutos (sin pantalla)")
+    parser.add_argument("--tk", dest="mode", action="store_const", const="tk",
+                        help="usar Tk real (por ejemplo bajo Xvfb)")
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--fonts", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--cold-start-runs", type=int, default=3)
+    parser.add_argument("--soak", type=int, default=0, metavar="CICLOS",
+                        help="agregar una prueba de resistencia de CICLOS ciclos de trabajo/descanso")
+    parser.add_argument("--output", default=None, help="archivo JSON de resultados")
+    parser.add_argument("--cold-start-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    stub = use_stub(args.mode)
+    if args.cold_start_child:
+        cold_start_child(stub)
+        return
+    if stub:
+        import tk_stub
+        tk_stub.install()
+
+    # Los archivos de la app se escriben en un directorio temporal; --output
+    # es relativo al directorio desde donde se llamó
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    os.chdir(tempfile.mkdtemp())
+    os.environ["POMODORO_CONFIG_DIR"] = os.getcwd()
+    import pomodoro
+    from soak import run_soak, virtual_time
+    clock, scheduler = virtual_time()
+    app = pomodoro.PomodoroApp(clock=clock.monotonic, wall_clock=clock.wall, scheduler=scheduler)
+    app.root.update()
+    app.show_break_alert = lambda: None
+
+    results = {
+        "format_time": bench_format_time(app, args.repeat * 10),
+        "tick": bench_tick(app, scheduler, args.repeat),
+        "apply_colors": bench_apply_colors(app, max(1, args.repeat // 10)),
+        "update_filtered_list": bench_font_search(app, synthetic_fonts(args.fonts), max(1, args.repeat // 10)),
+        "settings_io": bench_settings_io(app, args.events, max(1, args.repeat // 100)),
+    }
+    if args.soak:
+        app.play_alert_sound = lambda: None
+        results["soak"] = run_soak(app, scheduler, args.soak, report_every=max(1, args.soak // 4), out=sys.stderr)
+    app.on_close()
+    results["cold_start"] = bench_cold_start(stub, args.cold_start_runs)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": "stub" if stub else "tk",
+        "results": results
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
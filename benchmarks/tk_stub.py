@@ -0,0 +1,225 @@
+import itertools
+import sys
+import types
+
+# Sustitutos mínimos de customtkinter para medir la aplicación sin pantalla.
+# Registran las llamadas a configure() pero no dibujan nada, así que los
+# números miden el costo de la lógica de la app y no el de Tk.
+
+
+class StringVar:
+    def __init__(self, master=None, value=""):
+        self.value = value
+        self.callbacks = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for callback in self.callbacks:
+            callback()
+
+    def trace(self, mode, callback):
+        self.callbacks.append(callback)
+
+
+class Widget:
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = dict(options)
+        self.children = []
+        self.manager = ""
+        self.value = ""
+        if isinstance(master, Widget):
+            master.children.append(self)
+
+    def configure(self, cnf=None, **options):
+        self.options.update(cnf or {}, **options)
+
+    config = configure
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    def pack(self, **options):
+        self.manager = "pack"
+
+    def place(self, **options):
+        self.manager = "place"
+
+    def grid(self, **options):
+        self.manager = "grid"
+
+    def pack_forget(self):
+        self.manager = ""
+
+    place_forget = grid_remove = pack_forget
+
+    def winfo_manager(self):
+        return self.manager
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def winfo_exists(self):
+        return True
+
+    def winfo_ismapped(self):
+        return True
+
+    def winfo_x(self):
+        return 0
+
+    def winfo_y(self):
+        return 0
+
+    def destroy(self):
+        if isinstance(self.master, Widget) and self in self.master.children:
+            self.master.children.remove(self)
+
+    def get(self):
+        return self.value
+
+    def insert(self, index, value):
+        self.value = str(value)
+
+    def delete(self, *args):
+        self.value = ""
+
+    def set(self, *values):
+        self.value = values[0] if len(values) == 1 else values
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def after(self, ms, callback=None, *args):
+        return root().after(ms, callback, *args)
+
+    def after_idle(self, callback, *args):
+        return root().after_idle(callback, *args)
+
+    def after_cancel(self, job):
+        root().after_cancel(job)
+
+    def __getattr__(self, name):
+        # title, geometry, attributes, lift, grab_set, withdraw, etc.
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+
+class Tabview(Widget):
+    def __init__(self, master=None, command=None, **options):
+        super().__init__(master, **options)
+        self.tabs = {}
+
+    def add(self, name):
+        self.tabs[name] = Widget(self)
+        return self.tabs[name]
+
+    def tab(self, name):
+        return self.tabs[name]
+
+    def get(self):
+        return next(iter(self.tabs), "")
+
+
+class Root(Widget):
+    current = None
+
+    def __init__(self, **options):
+        super().__init__(None, **options)
+        self.jobs = {}
+        self.ids = itertools.count(1)
+        Root.current = self
+
+    def after(self, ms, callback=None, *args):
+        job = f"after#{next(self.ids)}"
+        self.jobs[job] = (ms, callback, args)
+        return job
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def update_idletasks(self):
+        for job, (ms, callback, args) in list(self.jobs.items()):
+            if ms == 0 and self.jobs.pop(job, None):
+                callback(*args)
+
+    def update(self):
+        self.update_idletasks()
+
+    def mainloop(self):
+        pass
+
+
+class Font:
+    # Métricas aproximadas: un ancho fijo por carácter
+    def __init__(self, family="", size=12, weight="normal", **options):
+        self.size = abs(int(size))
+
+    def measure(self, text):
+        return len(text) * self.size * 6 // 10
+
+    def metrics(self, option=None):
+        metrics = {"ascent": self.size, "descent": self.size // 4, "linespace": self.size * 5 // 4}
+        return metrics[option] if option else metrics
+
+
+class AppearanceModeTracker:
+    # Modo claro (0) u oscuro (1) y los widgets que siguen sus cambios
+    mode = 1
+    callbacks = []
+
+    @classmethod
+    def add(cls, callback, widget=None):
+        cls.callbacks.append(callback)
+
+    @classmethod
+    def remove(cls, callback):
+        if callback in cls.callbacks:
+            cls.callbacks.remove(callback)
+
+    @classmethod
+    def get_mode(cls):
+        return cls.mode
+
+    @classmethod
+    def set_appearance_mode(cls, mode_string):
+        mode = {"light": 0, "dark": 1}.get(str(mode_string).lower(), cls.mode)
+        if mode != cls.mode:
+            cls.mode = mode
+            for callback in list(cls.callbacks):
+                callback("Dark" if mode else "Light")
+
+
+def root():
+    return Root.current
+
+
+def install():
+    module = types.ModuleType("customtkinter")
+    module.CTk = Root
+    module.CTkTabview = Tabview
+    module.StringVar = StringVar
+    for name in ["CTkToplevel", "CTkFrame", "CTkScrollableFrame", "CTkLabel", "CTkButton",
+                 "CTkEntry", "CTkSlider", "CTkOptionMenu", "CTkScrollbar", "CTkCanvas", "CTkTextbox"]:
+        setattr(module, name, type(name, (Widget,), {}))
+    module.AppearanceModeTracker = AppearanceModeTracker
+    module.ThemeManager = types.SimpleNamespace(theme={"CTkLabel": {"text_color": ["gray10", "#DCE4EE"]}})
+    module.set_appearance_mode = AppearanceModeTracker.set_appearance_mode
+    module.set_default_color_theme = lambda *args: None
+    sys.modules["customtkinter"] = module
+
+    import tkinter
+    import tkinter.font
+    import tkinter.messagebox
+    tkinter.Label = type("Label", (Widget,), {})
+    tkinter.font.families = lambda *args, **kwargs: ()
+    tkinter.font.Font = Font
+    tkinter.messagebox.showinfo = lambda *args, **kwargs: None
+    tkinter.messagebox.showerror = lambda *args, **kwargs: None
@@ -0,0 +1,177 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+
+from paths import config_path
+
+CHECKPOINT_FILE = "checkpoint.bin"
+MAGIC = b"PMCK"
+VERSION = 1
+SUBJECT_BYTES = 240
+# magic, versión, secuencia, banderas, minutos de trabajo y de descanso,
+# segundos restantes, hora de pared al guardar, largo y bytes del tema
+RECORD = struct.Struct(f"<4sHIBHHddH{SUBJECT_BYTES}s")
+CRC = struct.Struct("<I")
+SLOT_SIZE = 512
+FILE_SIZE = 2 * SLOT_SIZE
+
+IS_BREAK = 1
+RUNNING = 2
+STARTED = 4
+
+# Una fase que terminó hace más que esto mientras la app estaba cerrada no
+# se da por completada: se empieza de cero
+STALE_AFTER = 15 * 60
+
+
+def _encode_subject(subject):
+    data = subject.encode("utf-8")[:SUBJECT_BYTES]
+    # No cortar un carácter UTF-8 por la mitad
+    return data.decode("utf-8", "ignore").encode("utf-8")
+
+
+class Checkpoint:
+    # Estado del temporizador en un archivo binario de tamaño fijo mapeado en
+    # memoria: guardar es copiar unos cientos de bytes, sin llamadas al
+    # sistema, y sobrevive a que maten el proceso. Hay dos ranuras que se
+    # escriben alternadas, cada una con número de secuencia y CRC, así una
+    # escritura a medias nunca deja el archivo sin un estado válido. Un hilo
+    # en segundo plano hace el msync (para sobrevivir a un reinicio del
+    # equipo) como mucho cada `sync_interval` segundos, nunca el hilo de Tk.
+    # Sólo se guarda en cada cambio de estado, no en cada tick: mientras
+    # corre, el tiempo restante se deduce de la hora de pared.
+
+    def __init__(self, path=None, clock=time.time, sync_interval=1.0):
+        self.path = path or config_path(CHECKPOINT_FILE)
+        self.clock = clock
+        self.sync_interval = sync_interval
+        self.seq = 0
+        self.saves = 0
+        self.syncs = 0
+        self.errors = 0
+        self._file = None
+        self._map = None
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def open(self):
+        # Mapea el archivo y devuelve el último estado válido (o None)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._file = os.fdopen(fd, "r+b")
+        if os.fstat(fd).st_size < FILE_SIZE:
+            self._file.truncate(FILE_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), FILE_SIZE)
+        records = [record for record in map(self._read_slot, range(2)) if record is not None]
+        if not records:
+            return None
+        latest = max(records, key=lambda record: record["seq"])
+        self.seq = latest["seq"]
+        return latest
+
+    def save(self, session):
+        if self._map is None:
+            return
+        flags = (IS_BREAK if session.is_break else 0) \
+            | (RUNNING if session.is_running else 0) \
+            | (STARTED if session.phase_started else 0)
+        self._safe_write(flags, session.work_time, session.break_time,
+                         session.timer.remaining(), session.subject)
+
+    def clear(self):
+        # Cierre normal: no hay nada que retomar
+        if self._map is not None:
+            self._safe_write(0, 0, 0, 0.0, "")
+
+    def _safe_write(self, *record):
+        # Se llama desde los suscriptores de la sesión: un checkpoint que no
+        # se pudo guardar nunca debe interrumpir al temporizador
+        try:
+            self._write(*record)
+        except (struct.error, ValueError, TypeError, OSError) as error:
+            self.errors += 1
+            if self.errors == 1:
+                print(f"[checkpoint] no se pudo guardar el estado: {error}", file=sys.stderr)
+
+    def close(self):
+        if self._map is None:
+            return
+        self._stop.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        self._map = self._file = None
+
+    def _write(self, flags, work_time, break_time, remaining, subject):
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        data = _encode_subject(subject)
+        body = RECORD.pack(MAGIC, VERSION, self.seq, flags, work_time, break_time,
+                           remaining, self.clock(), len(data), data)
+        offset = (self.seq % 2) * SLOT_SIZE
+        self._map[offset:offset + RECORD.size + CRC.size] = body + CRC.pack(zlib.crc32(body))
+        self.saves += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._dirty.set()
+
+    def _read_slot(self, index):
+        offset = index * SLOT_SIZE
+        body = self._map[offset:offset + RECORD.size]
+        (crc,) = CRC.unpack(self._map[offset + RECORD.size:offset + RECORD.size + CRC.size])
+        if zlib.crc32(body) != crc:
+            return None
+        magic, version, seq, flags, work_time, break_time, remaining, saved_at, length, data = \
+            RECORD.unpack(body)
+        if magic != MAGIC or version != VERSION:
+            return None
+        return {
+            "seq": seq,
+            "is_break": bool(flags & IS_BREAK),
+            "running": bool(flags & RUNNING),
+            "started": bool(flags & STARTED),
+            "work_time": work_time,
+            "break_time": break_time,
+            "remaining": remaining,
+            "saved_at": saved_at,
+            "subject": data[:length].decode("utf-8", "ignore")
+        }
+
+    def _run(self):
+        while True:
+            self._dirty.wait()
+            if self._stop.is_set():
+                return
+            self._dirty.clear()
+            self._map.flush()
+            self.syncs += 1
+            if self._stop.wait(self.sync_interval):
+                return
+
+
+def restore(session, record, now=None):
+    # Retoma en `session` la fase guardada. Si corría, se descuenta el tiempo
+    # (de pared) que pasó con la app cerrada; si ya debía haber terminado, se
+    # retoma con 0 s y el próximo tick la completa como de costumbre.
+    # Devuelve True si había algo que retomar.
+    if record is None or not record["started"] or not record["work_time"]:
+        return False
+    remaining = record["remaining"]
+    if record["running"]:
+        now = time.time() if now is None else now
+        remaining -= max(0.0, now - record["saved_at"])
+        if remaining < -STALE_AFTER:
+            return False
+    session.restore(
+        record["is_break"], max(0.0, remaining), record["running"],
+        record["work_time"], record["break_time"], record["subject"]
+    )
+    return True
@@ -0,0 +1,154 @@
+import tkinter as tk
+import tkinter.font as tkFont
+
+import customtkinter as ctk
+
+GLYPHS = "0123456789:"
+GLYPH_CACHE_SIZE = 8
+
+# Métricas de los glifos por fuente: se miden una vez por (familia, tamaño,
+# estilo) y se comparten entre todas las pantallas que usan esa fuente
+_glyph_cache = {}
+
+
+class GlyphAtlas:
+    # Fuente ya resuelta y el ancho de celda de cada glifo. Todos los dígitos
+    # ocupan una celda del mismo ancho, así el texto no "baila" al cambiar.
+
+    def __init__(self, font):
+        family, size, *style = font
+        self.font = tkFont.Font(
+            family=family,
+            size=size,
+            weight="bold" if "bold" in style else "normal"
+        )
+        self.digit_width = max(self.font.measure(digit) for digit in GLYPHS[:-1])
+        self.colon_width = self.font.measure(":")
+        self.height = self.font.metrics("linespace")
+
+    def width_of(self, char):
+        return self.colon_width if char == ":" else self.digit_width
+
+
+def glyph_atlas(font):
+    key = tuple(font)
+    atlas = _glyph_cache.get(key)
+    if atlas is None:
+        if len(_glyph_cache) >= GLYPH_CACHE_SIZE:
+            _glyph_cache.pop(next(iter(_glyph_cache)))
+        atlas = _glyph_cache[key] = GlyphAtlas(font)
+    return atlas
+
+
+def clear_glyph_cache():
+    _glyph_cache.clear()
+
+
+class CountdownDisplay(ctk.CTkCanvas):
+    # Reemplaza a un CTkLabel para el temporizador. Cada carácter es un ítem
+    # fijo del canvas; en cada tick sólo se cambia el texto de los ítems cuyo
+    # carácter cambió (normalmente uno), sin volver a medir ni a maquetar.
+    # Acepta las mismas opciones que usa la app con el label: text, font,
+    # text_color y fg_color, para funcionar con ViewRenderer y ThemeRegistry.
+    # Como un CTkLabel transparente, por omisión toma el fondo del marco que
+    # lo contiene y el color de texto del tema, y los vuelve a resolver al
+    # cambiar el modo claro/oscuro.
+
+    def __init__(self, master, text="", font=("Helvetica", 72, "bold"), text_color=None,
+                 fg_color="transparent", padding=4):
+        super().__init__(master, highlightthickness=0, borderwidth=0)
+        self.text = ""
+        self.font = tuple(font)
+        self.text_color = text_color or ctk.ThemeManager.theme["CTkLabel"]["text_color"]
+        self.fg_color = fg_color
+        self.padding = padding
+        self.items = []
+        self.atlas = None
+        self.redraws = 0
+        self.glyph_updates = 0
+        super().configure(bg=self._resolve(self._background()))
+        self._layout(text)
+        ctk.AppearanceModeTracker.add(self._set_appearance_mode, self)
+
+    def _resolve(self, color):
+        # Colores (claro, oscuro) de customtkinter según el modo actual
+        if isinstance(color, (tuple, list)):
+            return color[ctk.AppearanceModeTracker.get_mode()]
+        return color
+
+    def _background(self):
+        # "transparent": el fondo del primer contenedor que tenga uno
+        color, widget = self.fg_color, self.master
+        while color == "transparent" and widget is not None:
+            try:
+                color = widget.cget("fg_color")
+            except (tk.TclError, ValueError):
+                color = widget.cget("bg")
+            widget = widget.master
+        return color
+
+    def _set_appearance_mode(self, mode):
+        super().configure(bg=self._resolve(self._background()))
+        fill = self._resolve(self.text_color)
+        for item in self.items:
+            self.itemconfigure(item, fill=fill)
+
+    def destroy(self):
+        ctk.AppearanceModeTracker.remove(self._set_appearance_mode)
+        super().destroy()
+
+    def configure(self, cnf=None, **options):
+        text = options.pop("text", None)
+        font = options.pop("font", None)
+        color = options.pop("text_color", None)
+        fg_color = options.pop("fg_color", options.pop("bg", None))
+        if fg_color is not None:
+            self.fg_color = fg_color
+            options["bg"] = self._resolve(self._background())
+        if cnf or options:
+            super().configure(cnf, **options)
+        if font is not None and tuple(font) != self.font:
+            self.font = tuple(font)
+            self._layout(self.text if text is None else text)
+        elif text is not None:
+            self.set_text(text)
+        if color is not None and color != self.text_color:
+            self.text_color = color
+            for item in self.items:
+                self.itemconfigure(item, fill=self._resolve(color))
+
+    config = configure
+
+    def cget(self, key):
+        if key in ("text", "font", "text_color", "fg_color"):
+            return getattr(self, key)
+        return super().cget(key)
+
+    def set_text(self, text):
+        if len(text) != len(self.text) or any(
+            (a == ":") != (b == ":") for a, b in zip(text, self.text)
+        ):
+            # Cambió la forma (p. ej. 100:00 minutos): volver a maquetar
+            self._layout(text)
+            return
+        for index, (old, new) in enumerate(zip(self.text, text)):
+            if old != new:
+                self.itemconfigure(self.items[index], text=new)
+                self.glyph_updates += 1
+        self.text = text
+
+    def _layout(self, text):
+        self.atlas = glyph_atlas(self.font)
+        self.delete("all")
+        self.items = []
+        x = self.padding
+        for char in text:
+            width = self.atlas.width_of(char)
+            self.items.append(self.create_text(
+                x + width / 2, self.padding, text=char, anchor="n",
+                font=self.atlas.font, fill=self._resolve(self.text_color)
+            ))
+            x += width
+        super().configure(width=x + self.padding, height=self.atlas.height + 2 * self.padding)
+        self.text = text
+        self.redraws += 1
@@ -0,0 +1,181 @@
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from session_log import write_text_atomic
+
+# Límites (en segundos) de los buckets del histograma de retraso de ticks
+LAG_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SLOW_HANDLER = 0.05
+
+
+class Histogram:
+    # Histograma acumulativo con buckets fijos, como los de Prometheus
+    def __init__(self, buckets=LAG_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        # Aproximación: límite superior del bucket que contiene el cuantil
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+class Diagnostics:
+    # Instrumentación del bucle de eventos de Tk: cuánto se atrasa cada tick
+    # respecto de cuando se programó, cuántos configure() por segundo hacen
+    # los renderizadores y qué manejadores tardan demasiado.
+
+    def __init__(self, clock=time.perf_counter, slow_threshold=SLOW_HANDLER, log=None):
+        self.clock = clock
+        self.slow_threshold = slow_threshold
+        self.log = log
+        self.tick_lag = Histogram()
+        self.ticks = 0
+        self.expected = None
+        self.handlers = {}          # nombre -> Histogram de duraciones
+        self.slow = deque(maxlen=20)
+        self.slow_total = 0
+        self.counters = {}          # nombre -> función que devuelve el total acumulado
+        self.rates = {}
+        self.peak_rates = {}
+        self.last_sample = None
+
+    def tick_scheduled(self, delay):
+        # Se llama al programar el próximo tick con root.after(delay)
+        self.expected = self.clock() + delay
+
+    def tick_fired(self):
+        now = self.clock()
+        if self.expected is not None:
+            self.tick_lag.observe(max(0.0, now - self.expected))
+            self.expected = None
+        self.ticks += 1
+        self.sample_counters(now)
+
+    def add_counter(self, name, read):
+        self.counters[name] = read
+
+    def sample_counters(self, now=None):
+        # Calcula configure() por segundo como mucho una vez por segundo
+        now = self.clock() if now is None else now
+        totals = {name: read() for name, read in self.counters.items()}
+        if self.last_sample is None:
+            self.last_sample = (now, totals)
+            return
+        start, previous = self.last_sample
+        elapsed = now - start
+        if elapsed < 1.0:
+            return
+        for name, total in totals.items():
+            rate = (total - previous.get(name, 0)) / elapsed
+            self.rates[name] = rate
+            self.peak_rates[name] = max(self.peak_rates.get(name, 0.0), rate)
+        self.last_sample = (now, totals)
+
+    @contextmanager
+    def measure(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            self.handlers.setdefault(name, Histogram()).observe(elapsed)
+            if elapsed >= self.slow_threshold:
+                self.slow.append((time.time(), name, elapsed))
+                self.slow_total += 1
+                print(f"[diagnóstico] {name} tardó {elapsed * 1000:.1f} ms",
+                      file=self.log or sys.stderr)
+
+    def wrap(self, name, function):
+        def measured(*args, **kwargs):
+            with self.measure(name):
+                return function(*args, **kwargs)
+        return measured
+
+    def summary(self):
+        lines = [
+            f"Ticks: {self.ticks}",
+            f"Retraso de ticks: p50 ≤ {self.tick_lag.quantile(0.5) * 1000:.0f} ms · "
+            f"p99 ≤ {self.tick_lag.quantile(0.99) * 1000:.0f} ms · "
+            f"máx {self.tick_lag.max * 1000:.1f} ms"
+        ]
+        for name in self.counters:
+            lines.append(
+                f"{name}: {self.rates.get(name, 0.0):.1f}/s "
+                f"(pico {self.peak_rates.get(name, 0.0):.1f}/s, total {self.counters[name]()})"
+            )
+        for name, histogram in sorted(self.handlers.items()):
+            mean = histogram.sum / histogram.count if histogram.count else 0.0
+            lines.append(
+                f"{name}: {histogram.count} llamadas · media {mean * 1000:.1f} ms · "
+                f"máx {histogram.max * 1000:.1f} ms"
+            )
+        for ts, name, elapsed in reversed(self.slow):
+            lines.append(f"Lento {time.strftime('%H:%M:%S', time.localtime(ts))} "
+                         f"{name}: {elapsed * 1000:.1f} ms")
+        return "\n".join(lines)
+
+    def to_prometheus(self):
+        lines = []
+
+        def histogram(metric, data, labels=""):
+            sep = "," if labels else ""
+            for bound, total in data.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{{labels}{sep}le="{le}"}} {total}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{metric}_sum{suffix} {data.sum!r}")
+            lines.append(f"{metric}_count{suffix} {data.count}")
+
+        lines.append("# HELP pomodoro_tick_lag_seconds Retraso entre la hora programada de un tick y su ejecución")
+        lines.append("# TYPE pomodoro_tick_lag_seconds histogram")
+        histogram("pomodoro_tick_lag_seconds", self.tick_lag)
+
+        lines.append("# HELP pomodoro_configure_calls_total Llamadas a configure() por renderizador")
+        lines.append("# TYPE pomodoro_configure_calls_total counter")
+        for name, read in self.counters.items():
+            lines.append(f'pomodoro_configure_calls_total{{source="{name}"}} {read()}')
+        lines.append("# HELP pomodoro_configure_calls_per_second Último valor medido de configure() por segundo")
+        lines.append("# TYPE pomodoro_configure_calls_per_second gauge")
+        for name in self.counters:
+            lines.append(f'pomodoro_configure_calls_per_second{{source="{name}"}} {self.rates.get(name, 0.0)!r}')
+
+        lines.append("# HELP pomodoro_handler_seconds Duración de los manejadores instrumentados")
+        lines.append("# TYPE pomodoro_handler_seconds histogram")
+        for name, data in sorted(self.handlers.items()):
+            histogram("pomodoro_handler_seconds", data, f'handler="{name}"')
+        lines.append("# HELP pomodoro_slow_handlers_total Manejadores que superaron el umbral de lentitud")
+        lines.append("# TYPE pomodoro_slow_handlers_total counter")
+        lines.append(f"pomodoro_slow_handlers_total {self.slow_total}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        # Escritura atómica para que un lector (node_exporter) nunca vea medio archivo
+        write_text_atomic(path, self.to_prometheus())
@@ -0,0 +1,66 @@
+import customtkinter as ctk
+
+REFRESH_MS = 1000
+
+
+class DiagnosticsPanel:
+    # Panel de diagnóstico (F12). Como la ventana de ajustes, se construye una
+    # vez y luego se oculta; sólo se refresca mientras está visible.
+
+    def __init__(self, app):
+        self.app = app
+        self.refresh_id = None
+
+        self.window = ctk.CTkToplevel(app.root)
+        self.window.title("Diagnóstico")
+        self.window.geometry("520x360")
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        self.text = ctk.CTkTextbox(self.window, font=("Courier", 12), wrap="none")
+        self.text.pack(pady=(15, 5), padx=15, fill="both", expand=True)
+
+        button_frame = ctk.CTkFrame(self.window, fg_color="transparent")
+        button_frame.pack(pady=(5, 15))
+
+        export_button = ctk.CTkButton(
+            button_frame,
+            text="Exportar métricas",
+            command=self.export
+        )
+        export_button.pack(side="left", padx=5)
+
+        self.status_label = ctk.CTkLabel(button_frame, text="")
+        self.status_label.pack(side="left", padx=5)
+
+    def show(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.refresh()
+
+    def hide(self):
+        if self.refresh_id is not None:
+            self.window.after_cancel(self.refresh_id)
+            self.refresh_id = None
+        self.window.withdraw()
+
+    def toggle(self):
+        if self.refresh_id is None:
+            self.show()
+        else:
+            self.hide()
+
+    def refresh(self):
+        self.app.diagnostics.sample_counters()
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", self.app.diagnostics.summary())
+        self.text.configure(state="disabled")
+        self.refresh_id = self.window.after(REFRESH_MS, self.refresh)
+
+    def export(self):
+        try:
+            path = self.app.export_metrics()
+        except OSError as error:
+            self.status_label.configure(text=f"No se pudo guardar: {error.strerror or error}")
+            return
+        self.status_label.configure(text=f"Guardado en {path}")
@@ -0,0 +1,230 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+EVENTS = ("work_started", "work_completed", "break_started", "paused", "reset")
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 5.0
+MAX_QUEUE = 256
+
+
+def translate(event):
+    # Traduce un evento de PomodoroSession al nombre público del bus (o None).
+    # "start" se publica tanto al empezar una fase como al reanudarla.
+    kind = event["type"]
+    if kind == "start":
+        return "break_started" if event["phase"] == "break" else "work_started"
+    if kind == "complete" and event["phase"] == "work":
+        return "work_completed"
+    if kind == "pause":
+        return "paused"
+    if kind == "reset":
+        return "reset"
+    return None
+
+
+class Hook:
+    def __init__(self, callback, events=None, timeout=DEFAULT_TIMEOUT, name=None):
+        self.callback = callback
+        self.events = set(events) if events else None   # None: todos
+        self.timeout = timeout
+        self.name = name or getattr(callback, "__name__", repr(callback))
+        self.running = False
+        self.hung = False          # pasó su tiempo límite y sigue sin volver
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.skipped = 0
+
+    def wants(self, name):
+        return self.events is None or name in self.events
+
+
+class EventBus:
+    # Publica los cambios de fase a suscriptores externos (registro de horas,
+    # silenciar el chat, luces...) sin que ninguno pueda frenar al
+    # temporizador: publish() sólo encola y vuelve enseguida. Un grupo de
+    # hilos atiende la cola, que es acotada (si se llena se descartan los
+    # avisos más viejos). Si un suscriptor pasa su `timeout`, su hilo se da
+    # por perdido y se reemplaza por otro, y ese suscriptor no recibe más
+    # avisos hasta que termine la llamada colgada.
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_queue=MAX_QUEUE, clock=time.monotonic, log=None):
+        self.size = workers
+        self.max_queue = max_queue
+        self.clock = clock
+        self.log = log or sys.stderr
+        self.hooks = []
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._jobs = deque()
+        self._busy = {}            # hilo -> (hook, inicio) de la llamada en curso
+        self._workers = set()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def subscribe(self, callback, events=None, timeout=DEFAULT_TIMEOUT, name=None):
+        unknown = set(events or ()) - set(EVENTS)
+        if unknown:
+            raise ValueError(f"eventos desconocidos: {', '.join(sorted(unknown))}")
+        hook = Hook(callback, events, timeout, name)
+        with self._condition:
+            self.hooks.append(hook)
+        return hook
+
+    def unsubscribe(self, hook):
+        with self._condition:
+            if hook in self.hooks:
+                self.hooks.remove(hook)
+
+    def publish(self, name, **payload):
+        event = dict(payload, event=name)
+        with self._condition:
+            if self._closed:
+                return
+            self.published += 1
+            self._reap()
+            for hook in self.hooks:
+                if not hook.wants(name):
+                    continue
+                if hook.hung:
+                    hook.skipped += 1
+                    continue
+                if len(self._jobs) >= self.max_queue:
+                    self._jobs.popleft()
+                    self.dropped += 1
+                self._jobs.append((hook, event))
+            if self._jobs:
+                # Los hilos se crean recién con el primer aviso
+                while len(self._workers) < self.size:
+                    self._spawn()
+                self._condition.notify(len(self._jobs))
+
+    def on_session_event(self, event):
+        # Para suscribir el bus directamente a una PomodoroSession
+        name = translate(event)
+        if name is not None:
+            self.publish(name, **{key: value for key, value in event.items() if key != "type"})
+
+    def stats(self):
+        with self._condition:
+            return {
+                "published": self.published,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "queued": len(self._jobs),
+                "timeouts": sum(hook.timeouts for hook in self.hooks),
+                "errors": sum(hook.errors for hook in self.hooks)
+            }
+
+    def close(self, timeout=1.0):
+        # Da un momento a los avisos pendientes; los hilos colgados se abandonan
+        deadline = self.clock() + timeout
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            while self._jobs and self._workers and self.clock() < deadline:
+                self._condition.wait(max(0.0, deadline - self.clock()))
+            self._jobs.clear()
+            self._condition.notify_all()
+
+    def _spawn(self):
+        thread = threading.Thread(target=self._run, daemon=True, name="event-bus")
+        self._workers.add(thread)
+        thread.start()
+
+    def _reap(self):
+        # Abandona los hilos cuyo suscriptor pasó su tiempo límite
+        now = self.clock()
+        for thread, (hook, started) in list(self._busy.items()):
+            if hook.timeout and now - started > hook.timeout:
+                del self._busy[thread]
+                self._workers.discard(thread)
+                hook.hung = True
+                hook.timeouts += 1
+                # Lo que ya tenía en cola tampoco se le entrega
+                for job in [job for job in self._jobs if job[0] is hook]:
+                    self._jobs.remove(job)
+                    hook.skipped += 1
+                print(f"[eventos] {hook.name} superó {hook.timeout:g} s; se sigue sin esperarlo",
+                      file=self.log)
+        if not self._closed:
+            while len(self._workers) < self.size:
+                self._spawn()
+
+    def _next_job(self):
+        # Cada suscriptor recibe sus avisos de a uno y en orden: se toma el
+        # primero cuyo suscriptor no esté ocupado. Mientras haya una llamada
+        # en curso se espera con límite, para poder vigilarla.
+        me = threading.current_thread()
+        while me in self._workers:
+            for index, (hook, event) in enumerate(self._jobs):
+                if not hook.running:
+                    del self._jobs[index]
+                    return hook, event
+            if self._closed and not self._busy:
+                break
+            self._condition.wait(self._watch_interval())
+            self._reap()
+        return None
+
+    def _watch_interval(self):
+        timeouts = [hook.timeout for hook, _ in self._busy.values() if hook.timeout]
+        return min(timeouts) / 2 if timeouts else None
+
+    def _run(self):
+        me = threading.current_thread()
+        while True:
+            with self._condition:
+                job = self._next_job()
+                if job is None:
+                    self._workers.discard(me)
+                    self._condition.notify_all()
+                    return
+                hook, event = job
+                hook.running = True
+                hook.calls += 1
+                self._busy[me] = (hook, self.clock())
+                # Los hilos libres pasan a vigilar esta llamada
+                self._condition.notify_all()
+            try:
+                hook.callback(event)
+            except Exception as error:
+                hook.errors += 1
+                print(f"[eventos] {hook.name} falló con {event['event']}: {error!r}", file=self.log)
+            with self._condition:
+                hook.running = False
+                hook.hung = False
+                self.delivered += 1
+                if self._busy.pop(me, None) is None:
+                    # Este hilo fue reemplazado por tardar demasiado
+                    return
+                self._condition.notify_all()
+
+
+def command_hook(command, timeout=DEFAULT_TIMEOUT):
+    # Ejecuta un programa externo con el evento en JSON por la entrada
+    # estándar. A diferencia de una función, si se pasa del tiempo se mata.
+    def run(event):
+        subprocess.run(
+            command,
+            input=json.dumps(event, ensure_ascii=False).encode("utf-8"),
+            stdout=subprocess.DEVNULL,
+            timeout=timeout,
+            check=True
+        )
+    run.__name__ = " ".join(command)
+    return run
+
+
+def load_hooks(bus, configured):
+    # Registra los comandos de la clave "hooks" de los ajustes:
+    # [{"events": ["work_completed"], "command": ["notify-send", "..."], "timeout": 5}]
+    for entry in configured:
+        timeout = entry.get("timeout", DEFAULT_TIMEOUT)
+        # El proceso se mata al pasar su límite; el del bus queda como respaldo
+        bus.subscribe(command_hook(entry["command"], timeout), entry.get("events"), timeout + 1)
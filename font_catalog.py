@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+import threading
+
+from paths import config_path
+from session_log import write_json_atomic
+
+
+def font_directories():
+    # Directorios donde el sistema instala fuentes; su fecha de modificación
+    # cambia cuando se agregan o quitan fuentes
+    home = os.path.expanduser("~")
+    if sys.platform.startswith("win"):
+        windir = os.environ.get("WINDIR", r"C:\Windows")
+        local = os.environ.get("LOCALAPPDATA", os.path.join(home, "AppData", "Local"))
+        return [
+            os.path.join(windir, "Fonts"),
+            os.path.join(local, "Microsoft", "Windows", "Fonts")
+        ]
+    if sys.platform == "darwin":
+        return [
+            "/System/Library/Fonts",
+            "/Library/Fonts",
+            os.path.join(home, "Library", "Fonts")
+        ]
+    return [
+        "/usr/share/fonts",
+        "/usr/local/share/fonts",
+        os.path.join(home, ".fonts"),
+        os.path.join(home, ".local", "share", "fonts")
+    ]
+
+
+def font_signature(directories):
+    # Como fontconfig, se mira la fecha de cada subdirectorio: instalar una
+    # fuente en /usr/share/fonts/truetype/<familia> no cambia la del raíz
+    signature = []
+    for directory in directories:
+        try:
+            signature.append([directory, os.stat(directory).st_mtime_ns])
+        except OSError:
+            continue
+        for root, subdirs, _ in os.walk(directory):
+            subdirs.sort()
+            for subdir in subdirs:
+                path = os.path.join(root, subdir)
+                try:
+                    signature.append([path, os.stat(path).st_mtime_ns])
+                except OSError:
+                    continue
+    return signature
+
+
+class FontCatalog:
+    # Lista de fuentes del sistema guardada en disco. La caché se lee en un
+    # hilo en segundo plano y sólo se reconstruye (con tkFont.families(), que
+    # debe llamarse desde el hilo de Tk) cuando cambian los directorios de fuentes.
+
+    def __init__(self, cache_path=None, directories=None):
+        self.cache_path = cache_path or config_path("font_cache.json", legacy="pomodoro_font_cache.json")
+        self.directories = directories if directories is not None else font_directories()
+        self.fonts = []
+        self.ready = False
+        self.needs_refresh = False
+        self._signature = None
+        self._thread = None
+
+    def load_async(self):
+        self._thread = threading.Thread(target=self._load_cache, daemon=True)
+        self._thread.start()
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get(self, families):
+        # Devuelve la lista de inmediato; si la caché no sirve, la reconstruye
+        # en el momento con la función `families` (hilo de Tk)
+        self.wait()
+        if not self.ready:
+            self.refresh(families())
+        return self.fonts
+
+    def refresh(self, families):
+        self.fonts = sorted(set(families))
+        self.ready = True
+        self.needs_refresh = False
+        threading.Thread(target=self._save_cache, args=(list(self.fonts),), daemon=True).start()
+
+    def _load_cache(self):
+        self._signature = font_signature(self.directories)
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache["signature"] == self._signature:
+                self.fonts = cache["fonts"]
+                self.ready = True
+                return
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        self.needs_refresh = True
+
+    def _save_cache(self, fonts):
+        try:
+            write_json_atomic(self.cache_path, {"signature": self._signature, "fonts": fonts})
+        except OSError:
+            pass  # Sin caché la próxima vez simplemente se vuelve a construir
@@ -0,0 +1,125 @@
+from bisect import bisect_left
+
+import customtkinter as ctk
+
+MAX_GRAM = 3
+
+
+class FontIndex:
+    # Índice de n-gramas (de 1 a 3 caracteres) sobre los nombres de fuente.
+    # Las búsquedas cortas se responden con una sola consulta al diccionario y
+    # las largas sólo verifican los candidatos del trigrama menos frecuente.
+
+    def __init__(self, fonts):
+        self.fonts = fonts
+        self.lower = [font.lower() for font in self.fonts]
+        self.grams = {}
+        for i, name in enumerate(self.lower):
+            seen = set()
+            for n in range(1, MAX_GRAM + 1):
+                for start in range(len(name) - n + 1):
+                    gram = name[start:start + n]
+                    if gram not in seen:
+                        seen.add(gram)
+                        self.grams.setdefault(gram, []).append(i)
+        # Orden alfabético sin distinguir mayúsculas para buscar por prefijo
+        self.by_prefix = sorted((name, i) for i, name in enumerate(self.lower))
+
+    def search(self, text):
+        text = text.lower()
+        if not text:
+            return self.fonts
+        if len(text) <= MAX_GRAM:
+            matches = self.grams.get(text, [])
+        else:
+            postings = [self.grams.get(text[i:i + MAX_GRAM], []) for i in range(len(text) - MAX_GRAM + 1)]
+            candidates = min(postings, key=len)
+            matches = [i for i in candidates if text in self.lower[i]]
+
+        # Las fuentes que empiezan con el texto buscado van primero
+        prefix = []
+        start = bisect_left(self.by_prefix, (text, -1))
+        for name, i in self.by_prefix[start:]:
+            if not name.startswith(text):
+                break
+            prefix.append(i)
+        prefix_set = set(prefix)
+        return [self.fonts[i] for i in prefix] + [
+            self.fonts[i] for i in matches if i not in prefix_set
+        ]
+
+
+class VirtualFontList(ctk.CTkFrame):
+    # Lista virtualizada: un número fijo de filas que se reutilizan al
+    # desplazarse, sin importar cuántas fuentes coincidan con la búsqueda
+
+    def __init__(self, master, command, rows=14, **kwargs):
+        super().__init__(master, **kwargs)
+        self.command = command
+        self.items = []
+        self.offset = 0
+        self.row_fonts = [None] * rows
+
+        self.rows_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.rows_frame.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.rows = []
+        for i in range(rows):
+            # Las filas se muestran al asignarles una fuente en render()
+            row = ctk.CTkButton(self.rows_frame, text="", command=lambda r=i: self.on_row_click(r))
+            self.bind_wheel(row)
+            self.rows.append(row)
+        self.bind_wheel(self.rows_frame)
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self.scroll(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def set_items(self, items):
+        self.items = items
+        self.offset = 0
+        self.render()
+
+    def max_offset(self):
+        return max(0, len(self.items) - len(self.rows))
+
+    def scroll(self, units):
+        self.offset = min(max(0, self.offset + units), self.max_offset())
+        self.render()
+
+    def yview(self, action, value, unit=None):
+        # Interfaz de tk.Scrollbar: ("moveto", fracción) o ("scroll", n, "units"/"pages")
+        if action == "moveto":
+            self.offset = min(max(0, int(float(value) * len(self.items))), self.max_offset())
+            self.render()
+        elif action == "scroll":
+            step = len(self.rows) if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def render(self):
+        for i, row in enumerate(self.rows):
+            index = self.offset + i
+            font = self.items[index] if index < len(self.items) else None
+            if font == self.row_fonts[i]:
+                continue
+            self.row_fonts[i] = font
+            if font is None:
+                row.pack_forget()
+            else:
+                row.configure(text=f"{font} - AaBbCc", font=(font, 14))
+                if not row.winfo_manager():
+                    row.pack(pady=2, fill="x")
+        if self.items:
+            first = self.offset / len(self.items)
+            last = min(1.0, (self.offset + len(self.rows)) / len(self.items))
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
+
+    def on_row_click(self, row):
+        font = self.row_fonts[row]
+        if font is not None:
+            self.command(font)
@@ -0,0 +1,185 @@
+import getpass
+import json
+import os
+import secrets
+import socket
+import tempfile
+import threading
+import time
+
+from paths import config_path
+from session_log import write_text_atomic
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Cuánto espera una segunda ejecución a que la primera responda
+FORWARD_TIMEOUT = 1.0
+
+
+def _try_lock(f):
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _socket_path(name):
+    # Junto al socket del daemon (ver pomodoro_daemon.default_socket_path)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"pomodoro-{getpass.getuser()}-{name}.sock")
+
+
+class SingleInstance:
+    # Una sola instancia por usuario. La primera ejecución toma un candado
+    # sobre un archivo del directorio de configuración (el sistema lo suelta
+    # solo si el proceso muere) y escucha en un socket local; las siguientes
+    # no pueden tomarlo y le reenvían su comando por ese socket. La dirección
+    # y un token van en `<name>.address`, legible sólo por el usuario.
+
+    def __init__(self, name="app"):
+        self.name = name
+        self.lock_path = config_path(f"{name}.lock")
+        self.address_path = config_path(f"{name}.address")
+        self.token = None
+        self.handler = None
+        self.waiting = []          # comandos recibidos antes de tener handler
+        self._file = None
+        self._server = None
+        self._socket_path = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        f = open(self.lock_path, "a+")
+        f.seek(0)
+        if not _try_lock(f):
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self):
+        self.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def listen(self):
+        # Abre el socket apenas se toma el candado, antes de cargar la
+        # interfaz: lo que llegue mientras tanto se guarda para después
+        self.token = secrets.token_hex(16)
+        if hasattr(socket, "AF_UNIX") and os.name == "posix":
+            path = _socket_path(self.name)
+            if os.path.exists(path):
+                os.unlink(path)  # Socket de una ejecución que terminó mal
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            os.chmod(path, 0o600)
+            address = {"family": "unix", "path": path}
+            self._socket_path = path
+        else:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind(("127.0.0.1", 0))
+            address = {"family": "tcp", "port": server.getsockname()[1]}
+        server.listen(8)
+        self._server = server
+        write_text_atomic(self.address_path, json.dumps(dict(address, token=self.token)))
+        if fcntl is not None:
+            os.chmod(self.address_path, 0o600)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def set_handler(self, handler):
+        # `handler(cmd)` se llama desde el hilo del socket
+        with self._lock:
+            self.handler = handler
+            waiting, self.waiting = self.waiting, []
+        for cmd in waiting:
+            handler(cmd)
+
+    def close(self):
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.close()
+        for path in (self._socket_path, self.address_path):
+            if path and os.path.exists(path):
+                os.unlink(path)
+
+    def _serve(self):
+        while True:
+            server = self._server
+            if server is None:
+                return
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                conn.settimeout(FORWARD_TIMEOUT)
+                try:
+                    request = json.loads(conn.makefile("r", encoding="utf-8").readline())
+                    if request.get("token") != self.token:
+                        raise ValueError("token inválido")
+                    self._deliver(request["cmd"])
+                    response = {"ok": True}
+                except (OSError, ValueError, KeyError, TypeError, AttributeError) as error:
+                    response = {"ok": False, "error": str(error)}
+                try:
+                    conn.sendall((json.dumps(response) + "\n").encode("utf-8"))
+                except OSError:
+                    pass
+
+    def _deliver(self, cmd):
+        with self._lock:
+            if self.handler is None:
+                self.waiting.append(cmd)
+                return
+            handler = self.handler
+        handler(cmd)
+
+
+def forward(cmd, name="app", timeout=FORWARD_TIMEOUT):
+    # Envía `cmd` a la instancia en ejecución. Devuelve True si lo aceptó.
+    try:
+        with open(config_path(f"{name}.address"), "r") as f:
+            address = json.load(f)
+        if address["family"] == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            target = address["path"]
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            target = ("127.0.0.1", address["port"])
+        with sock:
+            sock.settimeout(timeout)
+            sock.connect(target)
+            sock.sendall((json.dumps({"cmd": cmd, "token": address["token"]}) + "\n").encode("utf-8"))
+            response = json.loads(sock.makefile("r", encoding="utf-8").readline())
+        return bool(response.get("ok"))
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def claim_or_forward(cmd, name="app", wait=2.0):
+    # Devuelve la SingleInstance si esta ejecución es la primera, o None si
+    # el comando se entregó a la que ya corre. Si la otra está arrancando
+    # (aún sin socket) o cerrándose, se reintenta un momento.
+    deadline = time.monotonic() + wait
+    while True:
+        instance = SingleInstance(name)
+        if instance.acquire():
+            instance.listen()
+            return instance
+        if forward(cmd, name):
+            return None
+        if time.monotonic() > deadline:
+            raise RuntimeError("Hay otra instancia de Pomodoro en ejecución pero no responde")
+        time.sleep(0.05)
@@ -0,0 +1,130 @@
+from collections import deque
+
+import customtkinter as ctk
+
+DEFAULT_TIMEOUT = 8.0
+MAX_VISIBLE = 3
+MAX_WAITING = 20
+
+
+class Notice:
+    def __init__(self, title, message="", style="toast", timeout=DEFAULT_TIMEOUT):
+        self.title = title
+        self.message = message
+        self.style = style
+        self.timeout = timeout
+        self.job = None
+
+
+class NotificationCenter:
+    # Cola de avisos no bloqueantes. Se muestran hasta MAX_VISIBLE a la vez,
+    # apilados; el resto espera su turno. Cada aviso se cierra solo al pasar
+    # su tiempo o con un clic, y nunca detiene al temporizador.
+
+    def __init__(self, root, max_visible=MAX_VISIBLE, max_waiting=MAX_WAITING):
+        self.root = root
+        self.max_visible = max_visible
+        self.active = []
+        # Si se acumulan demasiados avisos se descartan los más viejos
+        self.waiting = deque(maxlen=max_waiting)
+        self.views = []
+        self.shown = 0
+
+    def attach(self, view):
+        self.views.append(view)
+        view.render(self.active)
+
+    def detach(self, view):
+        if view in self.views:
+            self.views.remove(view)
+
+    def notify(self, title, message="", style="toast", timeout=DEFAULT_TIMEOUT):
+        notice = Notice(title, message, style, timeout)
+        self.waiting.append(notice)
+        self._fill()
+        return notice
+
+    def dismiss(self, notice):
+        if notice in self.active:
+            self.active.remove(notice)
+            if notice.job is not None:
+                self.root.after_cancel(notice.job)
+                notice.job = None
+        elif notice in self.waiting:
+            self.waiting.remove(notice)
+        self._fill()
+
+    def clear(self):
+        for notice in list(self.active):
+            self.dismiss(notice)
+        self.waiting.clear()
+
+    def _fill(self):
+        while self.waiting and len(self.active) < self.max_visible:
+            notice = self.waiting.popleft()
+            self.active.append(notice)
+            self.shown += 1
+            if notice.timeout:
+                notice.job = self.root.after(int(notice.timeout * 1000), lambda n=notice: self.dismiss(n))
+        for view in list(self.views):
+            view.render(self.active)
+
+
+class ToastStack:
+    # Avisos apilados en la esquina superior derecha de una ventana. Las
+    # ranuras se crean una vez y se reutilizan; sólo cambian texto y colores.
+
+    def __init__(self, master, center, theme, font_family="Helvetica", compact=False):
+        self.master = master
+        self.center = center
+        self.theme = theme
+        self.font_family = font_family
+        self.compact = compact
+        self.container = ctk.CTkFrame(master, fg_color="transparent")
+        self.slots = []
+
+    def _slot(self, index):
+        while len(self.slots) <= index:
+            frame = ctk.CTkFrame(self.container, corner_radius=8, border_width=1)
+            title = ctk.CTkLabel(frame, text="", font=(self.font_family, 11 if self.compact else 14, "bold"))
+            title.pack(padx=10, pady=(6, 0) if not self.compact else 2, anchor="w")
+            message = ctk.CTkLabel(frame, text="", font=(self.font_family, 12), justify="left")
+            if not self.compact:
+                message.pack(padx=10, pady=(0, 6), anchor="w")
+            slot = {"frame": frame, "title": title, "message": message, "notice": None}
+            for widget in (frame, title, message):
+                widget.bind("<Button-1>", lambda event, s=slot: s["notice"] and self.center.dismiss(s["notice"]))
+            self.theme.register(title, "label")
+            self.theme.register(message, "label")
+            self.slots.append(slot)
+        return self.slots[index]
+
+    def render(self, notices):
+        # La ventana flotante es pequeña: sólo muestra el aviso más reciente
+        if self.compact:
+            notices = notices[-1:]
+        for index, notice in enumerate(notices):
+            slot = self._slot(index)
+            if slot["notice"] is not notice:
+                slot["notice"] = notice
+                slot["title"].configure(text=notice.title)
+                slot["message"].configure(text=notice.message)
+                self.theme.register(slot["frame"], notice.style)
+                slot["frame"].configure(**self.theme.palette()[notice.style])
+            if not slot["frame"].winfo_manager():
+                slot["frame"].pack(pady=(0, 6), fill="x")
+        for slot in self.slots[len(notices):]:
+            slot["notice"] = None
+            slot["frame"].pack_forget()
+        if notices:
+            self.container.place(relx=1.0, rely=0.0, x=-12, y=12, anchor="ne")
+            self.container.lift()
+        else:
+            self.container.place_forget()
+
+    def destroy(self):
+        self.center.detach(self)
+        for slot in self.slots:
+            for widget in (slot["frame"], slot["title"], slot["message"]):
+                self.theme.unregister(widget)
+        self.container.destroy()
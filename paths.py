@@ -0,0 +1,33 @@
+import os
+import shutil
+import sys
+
+APP_NAME = "pomodoro-app"
+
+
+def config_dir():
+    # Directorio de configuración del usuario; POMODORO_CONFIG_DIR lo reemplaza
+    # (útil para benchmarks o para tener varios perfiles)
+    override = os.environ.get("POMODORO_CONFIG_DIR")
+    if override:
+        return override
+    home = os.path.expanduser("~")
+    if sys.platform.startswith("win"):
+        return os.path.join(os.environ.get("APPDATA", os.path.join(home, "AppData", "Roaming")), APP_NAME)
+    if sys.platform == "darwin":
+        return os.path.join(home, "Library", "Application Support", APP_NAME)
+    return os.path.join(os.environ.get("XDG_CONFIG_HOME", os.path.join(home, ".config")), APP_NAME)
+
+
+def config_path(name, legacy=None):
+    # Ruta de un archivo o directorio de la app. Si todavía existe la versión
+    # antigua relativa al directorio actual, se mueve allí una sola vez.
+    directory = config_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    if legacy and not os.path.exists(path) and os.path.exists(legacy):
+        try:
+            shutil.move(legacy, path)
+        except OSError:
+            return legacy  # Sin permisos para moverlo: seguir usando el antiguo
+    return path
@@ -1,58 +1,176 @@
-import customtkinter as ctk
-import tkinter as tk
-from tkinter import messagebox, filedialog, colorchooser
-import json
-from datetime import datetime
-from PIL import Image, ImageTk
+import time
+PROCESS_START = time.perf_counter()
+
+from datetime import datetime, date
 import os
-import winsound
-import threading
-import tkinter.font as tkFont
+import sys
+import argparse
+from pomodoro_core import PomodoroSession, MIN_MINUTES, MAX_MINUTES, start_from_fields, reset_from_field
+from session_log import SessionHistory
+from startup_profile import NullProfiler, StartupProfiler
+from diagnostics import Diagnostics
+from paths import config_path
+from settings_store import SettingsStore
+from timer_loop import TimerLoop, tick_delay
+from event_bus import EventBus, load_hooks
+from checkpoint import Checkpoint, restore
+
+# Comandos que una segunda ejecución reenvía a la instancia que ya corre
+INSTANCE_COMMANDS = ("show", "start", "pause", "toggle-float")
+
+# Los módulos de la interfaz se importan al crear la ventana (ver
+# load_gui_modules), así el modo daemon y los comandos de línea no los cargan.
+# Los diálogos, el selector de fuentes y la ventana de ajustes se importan
+# recién cuando se usan por primera vez.
+ctk = tk = tkFont = None
+ViewRenderer = InputCoalescer = ThemeRegistry = FontCatalog = None
+CountdownDisplay = clear_glyph_cache = NotificationCenter = ToastStack = None
+SubjectSuggestions = None
+
+
+def load_gui_modules():
+    global ctk, tk, tkFont, ViewRenderer, InputCoalescer, ThemeRegistry, FontCatalog
+    global CountdownDisplay, clear_glyph_cache, NotificationCenter, ToastStack, SubjectSuggestions
+    if ctk is not None:
+        return
+    import customtkinter as ctk
+    import tkinter as tk
+    import tkinter.font as tkFont
+    from render import ViewRenderer, InputCoalescer
+    from theme import ThemeRegistry
+    from font_catalog import FontCatalog
+    from countdown import CountdownDisplay, clear_glyph_cache
+    from notifications import NotificationCenter, ToastStack
+    from autocomplete import SubjectSuggestions
+
 
 class PomodoroApp:
-    def __init__(self):
-        self.root = ctk.CTk()
+    def __init__(self, socket_path=None, profiler=None, metrics_path=None,
+                 clock=time.monotonic, wall_clock=datetime.now, scheduler=None):
+        self.profiler = profiler or NullProfiler()
+        self.diagnostics = Diagnostics()
+        self.metrics_path = metrics_path
+        self.diagnostics_panel = None
+        with self.profiler.section("imports de la interfaz"):
+            load_gui_modules()
+        with self.profiler.section("ventana principal"):
+            self.root = ctk.CTk()
         self.root.title("Pomodoro App")
         self.root.geometry("800x600")
+        self.view = ViewRenderer(self.root)
+        self.input = InputCoalescer(self.root)
+        
+        # Todos los ajustes viven en un único almacén en memoria que se guarda
+        # en el directorio de configuración del usuario
+        self.store = SettingsStore()
+        with self.profiler.section("cargar ajustes"):
+            self.settings = self.store.load()
+
+        # Las fuentes del sistema se leen de una caché en segundo plano
+        self.font_catalog = FontCatalog()
+        self.font_catalog.load_async()
+        self.font_index = None
+        self.settings_window = None
+        self.audio = None
+        self.applied_alpha = None
+        self.float_position = None   # posición conocida de la ventana flotante
+        self.visible = {"root": True, "float": False}
+        self.float_window = None     # se crea la primera vez que se muestra
+        self.float_shown = False
         
-        # Configuración visual
-        self.settings = {
-            "theme": "dark",
-            "color_theme": "blue",
-            "font_family": "Helvetica",
-            "font_size": 24,
-            "custom_colors": {
-                "primary": "#1A1B26",        # Fondo principal (azul oscuro)
-                "secondary": "#24283B",      # Fondo secundario (azul medio)
-                "accent": "#7AA2F7",         # Acento (azul brillante)
-                "text": "#A9B1D6",          # Texto principal (gris claro)
-                "warning": "#F7768E"         # Alertas (rosa)
-            },
-            "transparency": 0.97,            # Transparencia de los widgets
-            "alert_sound": True              # Sonido de alerta activado/desactivado
-        }
-        
-        # Obtener todas las fuentes disponibles en el sistema
-        self.available_fonts = list(set(tkFont.families()))
-        self.available_fonts.sort()
-        
-        # Cargar configuración
-        self.load_visual_settings()
         ctk.set_appearance_mode(self.settings["theme"])
         ctk.set_default_color_theme(self.settings["color_theme"])
         
-        # Variables de tiempo
-        self.work_time = 25
-        self.break_time = 5
-        self.time_left = self.work_time * 60
-        self.is_running = False
-        self.is_break = False
-        self.timer_id = None
-        self.sessions_completed = 0
+        # Lógica del temporizador: local, o la de un daemon si se indica su socket
+        if socket_path:
+            from pomodoro_daemon import RemoteSession
+            self.session = RemoteSession(socket_path)
+            self.history = SessionHistory(writable=False)
+        else:
+            self.session = PomodoroSession(clock=clock, wall_clock=wall_clock)
+            self.history = SessionHistory()
+            self.session.subscribe(self.history.record)
+        # Acciones externas en cada cambio de fase, en hilos aparte. Con un
+        # daemon las ejecuta el daemon, para no repetirlas en cada cliente.
+        self.events = EventBus()
+        if not socket_path:
+            load_hooks(self.events, self.settings["hooks"])
+            self.session.subscribe(self.events.on_session_event)
+        self.session.on_tick = self.on_timer_tick
+        self.session.subscribe(self.on_session_event)
+        # Los ticks se programan con root.after salvo que se inyecte otro
+        # programador (p. ej. el virtual de simulation.py)
+        self.timer_loop = TimerLoop(self.session, scheduler or self.root,
+                                    self.next_tick_delay, self.diagnostics)
         
         # Crear interfaz
-        self.create_widgets()
-        self.load_settings()
+        self.theme = ThemeRegistry(self.root, self.settings["custom_colors"])
+        self.diagnostics.add_counter("view", lambda: self.view.configure_calls)
+        self.diagnostics.add_counter("theme", lambda: self.theme.configure_calls)
+        # Los lotes diferidos son donde realmente se hace el trabajo de dibujo
+        self.view.flush = self.diagnostics.wrap("render.flush", self.view.flush)
+        self.theme.flush = self.diagnostics.wrap("theme.flush", self.theme.flush)
+        # La compactación copia todo el estado en el hilo de Tk (desde record)
+        self.history.compact = self.diagnostics.wrap("history.compact", self.history.compact)
+        with self.profiler.section("create_widgets"):
+            self.create_widgets()
+            self.register_theme_widgets()
+        # Avisos no bloqueantes en la ventana principal (y en la flotante)
+        self.notifications = NotificationCenter(self.root)
+        self.notifications.attach(ToastStack(self.root, self.notifications, self.theme, self.settings["font_family"]))
+        self.break_alert = None
+        with self.profiler.section("load_settings"):
+            self.load_settings()
+        # Autocompletado de materias con el registro que mantiene el historial
+        self.suggestions = SubjectSuggestions(
+            self.subject_entry, self.history.stats.tasks, self.theme,
+            self.on_subject_changed, self.settings["font_family"]
+        )
+        # Estado del temporizador en un archivo mapeado en memoria para
+        # retomarlo si la app se cierra de golpe (con un daemon, lo guarda él)
+        self.checkpoint = None
+        if self.history.writable:
+            self.checkpoint = Checkpoint()
+            self.session.subscribe(self.save_checkpoint)
+            self.restore_checkpoint(self.checkpoint.open())
+        # Lo que no hace falta para el primer cuadro se prepara después
+        self.root.after_idle(self.on_first_frame)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<F12>", lambda event: self.toggle_diagnostics())
+        self.track_visibility(self.root, "root")
+        self.root.after(200, self.poll_font_catalog)
+
+    def on_first_frame(self):
+        self.profiler.mark("primer cuadro")
+        self.profiler.report()
+        self.start_audio()
+
+    def start_audio(self):
+        # El sonido de alerta se decodifica una vez en un hilo de audio
+        if self.audio is None:
+            from audio import AudioPlayer
+            # La campana de respaldo se toca desde el hilo de Tk
+            self.audio = AudioPlayer(ring=lambda: self.root.after(0, self.root.bell))
+            self.audio.start()
+
+    @property
+    def available_fonts(self):
+        return self.font_catalog.get(lambda: tkFont.families(self.root))
+
+    def get_font_index(self):
+        # El índice se reconstruye sólo si cambió la lista de fuentes
+        fonts = self.available_fonts
+        if self.font_index is None or self.font_index.fonts is not fonts:
+            from font_picker import FontIndex
+            self.font_index = FontIndex(fonts)
+        return self.font_index
+
+    def poll_font_catalog(self):
+        # Reconstruir la caché de fuentes cuando la ventana ya está visible
+        if self.font_catalog.needs_refresh:
+            self.font_catalog.refresh(tkFont.families(self.root))
+        elif not self.font_catalog.ready:
+            self.root.after(200, self.poll_font_catalog)
 
     def create_widgets(self):
         # Frame principal con padding y esquinas redondeadas
@@ -87,6 +205,7 @@ class PomodoroApp:
             corner_radius=8
         )
         self.subject_entry.pack(pady=10)
+        self.subject_entry.bind("<KeyRelease>", self.on_subject_changed)
 
         # Timer Frame con diseño moderno
         self.timer_frame = ctk.CTkFrame(self.main_frame, corner_radius=10)
@@ -96,7 +215,9 @@ class PomodoroApp:
         timer_display = ctk.CTkFrame(self.timer_frame, corner_radius=15)
         timer_display.pack(pady=15, padx=20, fill="x")
 
-        self.timer_label = ctk.CTkLabel(
+        # Cuenta regresiva en un canvas: cada tick sólo cambia los dígitos que cambiaron
+        self.timer_display = timer_display
+        self.timer_label = CountdownDisplay(
             timer_display,
             text=self.format_time(self.time_left),
             font=(self.settings["font_family"], 72, "bold")
@@ -212,438 +333,340 @@ class PomodoroApp:
         )
         self.sessions_label.pack(pady=5)
 
+        self.stats_label = ctk.CTkLabel(
+            self.stats_frame,
+            text="",
+            font=("Helvetica", 12)
+        )
+        self.stats_label.pack(pady=(0, 5))
+
+    def register_theme_widgets(self):
+        self.theme.register(self.root, "root")
+        for frame in [self.main_frame, self.title_frame, self.timer_frame, self.timer_display,
+                      self.time_config_frame, self.button_frame, self.stats_frame]:
+            self.theme.register(frame, "frame")
+        self.theme.register(self.timer_label, "countdown")
+        for label in [self.title_label, self.subtitle_label, self.work_time_label,
+                      self.break_time_label, self.sessions_label, self.stats_label]:
+            self.theme.register(label, "label")
+        for button in [self.start_button, self.pause_button, self.reset_button,
+                       self.settings_button, self.float_button]:
+            self.theme.register(button, "button")
+        for entry in [self.subject_entry, self.work_time_entry, self.break_time_entry]:
+            self.theme.register(entry, "entry")
+
     def format_time(self, seconds):
         mins = seconds // 60
         secs = seconds % 60
         return f"{mins:02d}:{secs:02d}"
 
-    def update_timer(self):
-        if self.is_running:
-            if self.time_left > 0:
-                self.time_left -= 1
-                # Actualizar ambos temporizadores
-                self.timer_label.configure(text=self.format_time(self.time_left))
-                self.update_floating_timer()
-                self.timer_id = self.root.after(1000, self.update_timer)
-            else:
-                self.is_running = False
-                if not self.is_break:
-                    self.sessions_completed += 1
-                    self.sessions_label.configure(
-                        text=f"Sesiones completadas hoy: {self.sessions_completed}"
-                    )
-                    self.save_settings()
-                    self.play_alert_sound()
-                    self.show_break_alert()
-                    self.time_left = int(self.break_time_entry.get()) * 60
-                    self.is_break = True
-                    self.start_timer()
-                else:
-                    messagebox.showinfo(
-                        "¡Descanso terminado!",
-                        "Es hora de volver al estudio."
-                    )
-                    self.time_left = int(self.work_time_entry.get()) * 60
-                    self.is_break = False
-                    self.start_timer()
+    @property
+    def time_left(self):
+        return self.session.seconds_left()
 
-    def start_timer(self):
-        try:
-            if not self.is_running:
-                if not self.is_break:
-                    self.work_time = int(self.work_time_entry.get())
-                    if self.time_left == self.break_time * 60:
-                        self.time_left = self.work_time * 60
-                self.is_running = True
-                self.start_button.configure(state="disabled")
-                self.pause_button.configure(state="normal")
-                self.update_timer()
-        except ValueError:
-            messagebox.showerror(
-                "Error",
-                "Por favor, ingresa números válidos para los tiempos de trabajo y descanso"
-            )
+    @property
+    def is_running(self):
+        return self.session.is_running
 
-    def pause_timer(self):
-        if self.is_running:
-            self.is_running = False
-            if self.timer_id:
-                self.root.after_cancel(self.timer_id)
-            self.start_button.configure(state="normal")
-            self.pause_button.configure(state="disabled")
+    @property
+    def is_break(self):
+        return self.session.is_break
 
-    def reset_timer(self):
-        self.pause_timer()
-        self.is_break = False
-        self.time_left = int(self.work_time_entry.get()) * 60
-        self.timer_label.configure(text=self.format_time(self.time_left))
-        self.start_button.configure(state="normal")
-        self.pause_button.configure(state="disabled")
-        # Actualizar la ventana flotante si existe
-        if hasattr(self, 'float_window'):
-            self.update_floating_timer()
+    @property
+    def work_time(self):
+        return self.session.work_time
 
-    def open_settings_window(self):
-        settings_window = ctk.CTkToplevel(self.root)
-        settings_window.title("Ajustes")
-        settings_window.geometry("600x700")
-        settings_window.grab_set()  # Hace la ventana modal
-
-        # Frame principal de ajustes con scroll
-        settings_frame = ctk.CTkScrollableFrame(settings_window)
-        settings_frame.pack(pady=20, padx=20, fill="both", expand=True)
-
-        # Sección de Apariencia
-        appearance_label = ctk.CTkLabel(
-            settings_frame, 
-            text="Apariencia",
-            font=(self.settings["font_family"], 20, "bold")
-        )
-        appearance_label.pack(pady=10)
-
-        # Tema
-        theme_label = ctk.CTkLabel(settings_frame, text="Tema:", font=(self.settings["font_family"], 16))
-        theme_label.pack(pady=5)
-        theme_var = ctk.StringVar(value=self.settings["theme"])
-        theme_menu = ctk.CTkOptionMenu(
-            settings_frame,
-            values=["dark", "light"],
-            variable=theme_var,
-            command=lambda x: self.change_theme(x)
-        )
-        theme_menu.pack(pady=5)
+    @property
+    def break_time(self):
+        return self.session.break_time
 
-        # Transparencia
-        transparency_frame = ctk.CTkFrame(settings_frame)
-        transparency_frame.pack(pady=10, fill="x")
-        
-        transparency_label = ctk.CTkLabel(
-            transparency_frame,
-            text="Transparencia:",
-            font=(self.settings["font_family"], 16)
-        )
-        transparency_label.pack(side="left", padx=10)
-        
-        transparency_slider = ctk.CTkSlider(
-            transparency_frame,
-            from_=0.5,
-            to=1.0,
-            number_of_steps=50,
-            command=lambda x: self.change_transparency(x)
-        )
-        transparency_slider.set(self.settings.get("transparency", 0.95))
-        transparency_slider.pack(side="right", padx=10, fill="x", expand=True)
+    @property
+    def sessions_completed(self):
+        return self.session.sessions_completed
 
-        # Colores
-        colors_label = ctk.CTkLabel(settings_frame, text="Colores:", font=(self.settings["font_family"], 16))
-        colors_label.pack(pady=5)
-        
-        # Frame para los botones de colores
-        colors_frame = ctk.CTkFrame(settings_frame)
-        colors_frame.pack(pady=5, fill="x")
-        
-        color_options = [
-            ("Color principal", "primary"),
-            ("Color secundario", "secondary"),
-            ("Color de acento", "accent"),
-            ("Color de texto", "text"),
-            ("Color de alerta", "warning")
-        ]
-        
-        for color_name, color_key in color_options:
-            color_frame = ctk.CTkFrame(colors_frame)
-            color_frame.pack(pady=2, fill="x")
-            
-            preview = tk.Label(
-                color_frame,
-                bg=self.settings["custom_colors"][color_key],
-                width=3,
-                height=1
-            )
-            preview.pack(side="left", padx=5, pady=5)
-            
-            label = ctk.CTkLabel(
-                color_frame,
-                text=color_name,
-                font=(self.settings["font_family"], 14)
-            )
-            label.pack(side="left", padx=5)
-            
-            button = ctk.CTkButton(
-                color_frame,
-                text="Cambiar",
-                width=100,
-                command=lambda k=color_key: self.choose_color(k)
-            )
-            button.pack(side="right", padx=5)
+    @property
+    def stats(self):
+        return self.history.stats
 
-        # Fuentes
-        font_section = ctk.CTkLabel(
-            settings_frame,
-            text="Fuentes",
-            font=(self.settings["font_family"], 20, "bold")
-        )
-        font_section.pack(pady=10)
+    def on_timer_tick(self, seconds):
+        # Sólo se llama cuando el segundo mostrado cambia
+        self.view.set(self.timer_label, text=self.format_time(seconds))
+        self.update_floating_timer()
 
-        # Frame para la fuente
-        font_frame = ctk.CTkFrame(settings_frame)
-        font_frame.pack(pady=10, fill="x")
-        
-        font_label = ctk.CTkLabel(
-            font_frame,
-            text="Fuente:",
-            font=(self.settings["font_family"], 16)
-        )
-        font_label.pack(side="left", padx=10)
-        
-        # Crear un Combobox para las fuentes con búsqueda
-        font_var = ctk.StringVar(value=self.settings["font_family"])
-        font_entry = ctk.CTkEntry(
-            font_frame,
-            textvariable=font_var,
-            width=200
-        )
-        font_entry.pack(side="left", padx=10)
-        
+    def on_subject_changed(self, event=None):
+        self.session.set_subject(self.subject_entry.get())
+        self.save_checkpoint()
+        # Como mucho una búsqueda por cuadro aunque se escriba muy rápido
+        self.input.submit("subject", self.suggestions.update, self.subject_entry.get())
+        if self.float_window is not None:
+            self.view.set(self.float_title_label, text=self.subject_entry.get() or "Estudiando...")
+
+    def save_checkpoint(self, event=None):
+        if self.checkpoint is not None:
+            self.checkpoint.save(self.session)
+
+    def restore_checkpoint(self, record):
+        if not restore(self.session, record):
+            return
+        self.show_durations()
+        self.subject_entry.delete(0, tk.END)
+        self.subject_entry.insert(0, self.session.subject)
+        self.on_subject_changed()
+        phase = "el descanso" if self.is_break else "la sesión de trabajo"
+        self.notifications.notify(
+            "Sesión retomada",
+            f"Se retomó {phase} que quedó a medias ({self.format_time(self.time_left)} restantes)."
+        )
+
+    def update_sessions_label(self):
+        self.view.set(self.sessions_label, text=f"Sesiones completadas hoy: {self.sessions_completed}")
 
-        
-        def select_font(font_name):
-            font_var.set(font_name)
-            font_preview.configure(font=(font_name, 14))
-            self.change_font(font_name)
-            
-        def show_font_list():
-            nonlocal font_preview  # Hacer font_preview accesible en el scope interno
-            
-            # Crear ventana de selección de fuente
-            font_list = ctk.CTkToplevel(settings_frame)
-            font_list.title("Seleccionar Fuente")
-            font_list.geometry("400x600")
-            font_list.grab_set()  # Hacer la ventana modal
-            
-            # Barra de búsqueda
-            search_frame = ctk.CTkFrame(font_list)
-            search_frame.pack(pady=10, padx=10, fill="x")
-            
-            search_label = ctk.CTkLabel(
-                search_frame,
-                text="Buscar fuente:",
-                font=(self.settings["font_family"], 14)
-            )
-            search_label.pack(side="left", padx=5)
-            
-            search_var = ctk.StringVar()
-            search_var.trace('w', lambda *args: update_filtered_list())
-            
-            search_entry = ctk.CTkEntry(
-                search_frame,
-                textvariable=search_var,
-                width=200
+    def update_timer(self):
+        self.timer_loop.tick()
+
+    def next_tick_delay(self):
+        return tick_delay(self.session, any(self.visible.values()))
+
+    def track_visibility(self, window, name):
+        # <Unmap> también llega al minimizar (iconify). Los eventos de los
+        # widgets hijos se propagan a la ventana, así que se filtran.
+        window.bind("<Map>", lambda event: event.widget is window and self.set_visible(name, True), add="+")
+        window.bind("<Unmap>", lambda event: event.widget is window and self.set_visible(name, False), add="+")
+
+    def set_visible(self, name, visible):
+        was_visible = any(self.visible.values())
+        self.visible[name] = visible
+        if visible and not was_visible:
+            # Volver a mostrar el estado actual enseguida, sin esperar al
+            # tick largo que se programó mientras todo estaba oculto
+            self.timer_loop.wake()
+
+    def schedule_tick(self):
+        self.timer_loop.schedule()
+
+    def on_session_event(self, event):
+        # La interfaz reacciona a los eventos de la sesión (local o del daemon)
+        if not self.history.writable:
+            self.history.apply(event)
+        if event["type"] == "start":
+            self.view.set(self.start_button, state="disabled")
+            self.view.set(self.pause_button, state="normal")
+            self.schedule_tick()
+        elif event["type"] in ("pause", "reset"):
+            self.view.set(self.start_button, state="normal")
+            self.view.set(self.pause_button, state="disabled")
+        elif event["type"] == "disconnected":
+            # Sólo con --connect: el daemon ya no responde
+            self.view.set(self.start_button, state="disabled")
+            self.view.set(self.pause_button, state="disabled")
+            self.notifications.notify(
+                "Sin conexión",
+                "Se perdió la conexión con el daemon de Pomodoro.\nReinícialo y vuelve a abrir la ventana.",
+                style="toast_warning"
             )
-            search_entry.pack(side="left", padx=5, fill="x", expand=True)
-            
-            # Frame con scroll para las fuentes
-            global list_frame  # Hacer accesible para la función de actualización
-            list_frame = ctk.CTkScrollableFrame(font_list)
-            list_frame.pack(pady=10, padx=10, fill="both", expand=True)
-            
-            def update_filtered_list():
-                search_text = search_var.get().lower()
-                filtered_fonts = [f for f in self.available_fonts if search_text in f.lower()]
-                
-                # Limpiar lista actual
-                for widget in list_frame.winfo_children():
-                    widget.destroy()
-                
-                # Mostrar fuentes filtradas
-                for font in filtered_fonts[:100]:
-                    font_button = ctk.CTkButton(
-                        list_frame,
-                        text=f"{font} - AaBbCc",
-                        font=(font, 14),
-                        command=lambda f=font: [
-                            select_font(f),
-                            font_list.destroy()
-                        ]
-                    )
-                    font_button.pack(pady=2, fill="x")
-            
-            # Mostrar todas las fuentes inicialmente
-            update_filtered_list()
-        
-        font_button = ctk.CTkButton(
-            font_frame,
-            text="Buscar",
-            command=show_font_list,
-            width=100
-        )
-        font_button.pack(side="left", padx=10)
-        
-        # Preview de la fuente
-        font_preview = ctk.CTkLabel(
-            font_frame,
-            text="Vista previa AaBbCc",
-            font=(font_var.get(), 14)
-        )
-        font_preview.pack(side="right", padx=10)
+        elif event["type"] == "complete":
+            # Ningún aviso espera al usuario: la siguiente fase ya empezó
+            if event["phase"] == "work":
+                self.update_sessions_label()
+                self.update_stats_label()
+                self.play_alert_sound()
+                with self.diagnostics.measure("show_break_alert"):
+                    self.show_break_alert()
+            else:
+                self.close_break_alert()
+                self.notifications.notify(
+                    "¡Descanso terminado!",
+                    "Es hora de volver al estudio."
+                )
 
-        # Tamaño de fuente
-        size_label = ctk.CTkLabel(font_frame, text="Tamaño:", font=(self.settings["font_family"], 16))
-        size_label.pack(side="left", padx=10)
-        
-        size_var = ctk.StringVar(value=str(self.settings["font_size"]))
-        size_entry = ctk.CTkEntry(font_frame, width=50, textvariable=size_var)
-        size_entry.pack(side="left", padx=10)
-
-        # Espacio para futuras secciones de configuración
-        spacer = ctk.CTkFrame(settings_frame, height=20)
-        spacer.pack()
-
-        # Botón para guardar
-        save_button = ctk.CTkButton(
-            settings_frame,
-            text="Guardar cambios",
-            command=lambda: self.save_visual_settings(size_var.get())
+    def start_timer(self):
+        try:
+            start_from_fields(self.session, self.work_time_entry.get(), self.break_time_entry.get())
+        except ValueError:
+            self.notify_invalid_durations()
+
+    def notify_invalid_durations(self):
+        self.notifications.notify(
+            "Error",
+            f"Por favor, ingresa números válidos para los tiempos\nde trabajo y descanso "
+            f"(entre {MIN_MINUTES} y {MAX_MINUTES} minutos)",
+            style="toast_warning"
         )
-        save_button.pack(pady=20)
+
+    def pause_timer(self):
+        self.session.pause()
+
+    def reset_timer(self):
+        try:
+            reset_from_field(self.session, self.work_time_entry.get())
+        except ValueError:
+            self.notify_invalid_durations()
+
+    def on_instance_command(self, cmd):
+        # Llega desde el hilo del socket de la instancia: se pasa al de Tk
+        if cmd in INSTANCE_COMMANDS:
+            self.root.after(0, self.run_command, cmd)
+
+    def run_command(self, cmd):
+        if cmd == "start":
+            self.start_timer()
+        elif cmd == "pause":
+            self.pause_timer()
+        elif cmd == "toggle-float":
+            self.toggle_float_window()
+        else:
+            self.root.deiconify()
+            self.root.lift()
+            self.root.focus_force()
+
+    def open_settings_window(self):
+        # La ventana se construye una vez y luego sólo se oculta y se muestra
+        if self.settings_window is None:
+            from settings_window import SettingsWindow
+            self.settings_window = SettingsWindow(self)
+        self.settings_window.show()
+
+    def toggle_diagnostics(self):
+        if self.diagnostics_panel is None:
+            from diagnostics_panel import DiagnosticsPanel
+            self.diagnostics_panel = DiagnosticsPanel(self)
+        self.diagnostics_panel.toggle()
+
+    def export_metrics(self):
+        # Formato de texto de Prometheus (p. ej. para el textfile collector)
+        path = self.metrics_path or config_path("metrics.prom")
+        self.diagnostics.export(path)
+        return path
 
     def choose_color(self, color_key):
+        from tkinter import colorchooser
         color = colorchooser.askcolor(title="Elige un color")[1]
         if color:
             self.settings["custom_colors"][color_key] = color
+            self.store.changed()
             self.apply_colors()
 
     def change_theme(self, theme):
-        self.settings["theme"] = theme
+        self.store.set("theme", theme)
         ctk.set_appearance_mode(theme)
 
     def change_font(self, font_family):
-        self.settings["font_family"] = font_family
+        self.store.set("font_family", font_family)
         self.apply_font()
 
     def apply_font(self):
+        # Las métricas de los glifos de la fuente anterior ya no sirven
+        clear_glyph_cache()
         # Actualizar fuentes en widgets principales
         self.title_label.configure(font=(self.settings["font_family"], self.settings["font_size"], "bold"))
         self.timer_label.configure(font=(self.settings["font_family"], self.settings["font_size"] * 2))
         self.sessions_label.configure(font=(self.settings["font_family"], int(self.settings["font_size"] * 0.6)))
 
     def apply_colors(self):
-        # Aplicar colores personalizados a los widgets
-        colors = self.settings["custom_colors"]
-        
-        # Configurar colores del root y frames
-        self.root.configure(fg_color=colors["primary"])
-        for frame in [self.main_frame, self.title_frame, self.timer_frame, 
-                     self.time_config_frame, self.button_frame, self.stats_frame]:
-            frame.configure(
-                fg_color=colors["secondary"],
-                bg_color=colors["primary"]
-            )
+        # Los colores se aplican en un solo lote a todos los widgets registrados
+        with self.diagnostics.measure("apply_colors"):
+            self.theme.apply(self.settings["custom_colors"])
 
-        # Configurar colores de las etiquetas
-        for label in [self.title_label, self.timer_label, self.work_time_label,
-                     self.break_time_label, self.sessions_label]:
-            label.configure(
-                text_color=colors["text"],
-                fg_color="transparent"
-            )
-
-        # Configurar colores de los botones
-        for button in [self.start_button, self.pause_button, self.reset_button, self.settings_button]:
-            button.configure(
-                fg_color=colors["accent"],
-                text_color=colors["primary"],
-                hover_color=colors["text"]
-            )
-            
-        # Configurar colores de las entradas
-        for entry in [self.subject_entry, self.work_time_entry, self.break_time_entry]:
-            entry.configure(
-                fg_color=colors["text"],
-                text_color=colors["primary"],
-                border_color=colors["accent"]
-            )
-            
-        # Ajustar transparencia
-        self.apply_transparency()
+            # Ajustar transparencia
+            self.apply_transparency()
 
     def save_visual_settings(self, font_size):
+        from tkinter import messagebox
         try:
-            self.settings["font_size"] = int(font_size)
+            self.store.set("font_size", int(font_size))
             self.apply_font()
-            
-            # Guardar configuración en archivo
-            visual_settings = {
-                "theme": self.settings["theme"],
-                "color_theme": self.settings["color_theme"],
-                "font_family": self.settings["font_family"],
-                "font_size": self.settings["font_size"],
-                "custom_colors": self.settings["custom_colors"]
-            }
-            
-            with open("pomodoro_visual_settings.json", "w") as f:
-                json.dump(visual_settings, f)
-                
+            # Guardar ya, sin esperar a que se agrupen más cambios
+            self.store.flush()
             messagebox.showinfo("Éxito", "Configuración guardada correctamente")
         except ValueError:
             messagebox.showerror("Error", "El tamaño de fuente debe ser un número")
 
-    def load_visual_settings(self):
-        try:
-            with open("pomodoro_visual_settings.json", "r") as f:
-                visual_settings = json.load(f)
-                self.settings.update(visual_settings)
-        except FileNotFoundError:
-            pass
-
     def save_settings(self):
-        settings = {
-            "work_time": self.work_time,
-            "break_time": self.break_time,
-            "sessions_completed": self.sessions_completed,
-            "last_date": datetime.now().strftime("%Y-%m-%d")
-        }
-        with open("pomodoro_settings.json", "w") as f:
-            json.dump(settings, f)
+        # Compactar el historial en un snapshot del estado actual
+        self.history.compact()
 
     def load_settings(self):
-        try:
-            with open("pomodoro_settings.json", "r") as f:
-                settings = json.load(f)
-                if settings["last_date"] == datetime.now().strftime("%Y-%m-%d"):
-                    self.sessions_completed = settings["sessions_completed"]
-                self.work_time = settings["work_time"]
-                self.break_time = settings["break_time"]
-                self.work_time_entry.delete(0, tk.END)
-                self.work_time_entry.insert(0, str(self.work_time))
-                self.break_time_entry.delete(0, tk.END)
-                self.break_time_entry.insert(0, str(self.break_time))
-        except FileNotFoundError:
-            pass
+        state = self.history.load()
+        self.update_stats_label()
+        if self.history.writable:
+            self.session.sessions_completed = self.history.sessions_today()
+            self.session.set_durations(state["work_time"], state["break_time"])
+        else:
+            self.schedule_tick()  # Recibir el estado inicial del daemon
+        self.update_sessions_label()
+        self.show_durations()
+
+    def show_durations(self):
+        self.work_time_entry.delete(0, tk.END)
+        self.work_time_entry.insert(0, str(self.work_time))
+        self.break_time_entry.delete(0, tk.END)
+        self.break_time_entry.insert(0, str(self.break_time))
+
+    def update_stats_label(self):
+        today = date.today()
+        self.view.set(
+            self.stats_label,
+            text=(
+                f"Esta semana: {self.stats.minutes_in_week(today)} min de enfoque · "
+                f"Racha: {self.stats.current_streak(today)} días · "
+                f"Días activos (30): {self.stats.active_days(today)}"
+            )
+        )
+
+    def on_close(self):
+        if self.metrics_path:
+            try:
+                self.export_metrics()
+            except OSError as error:
+                print(f"No se pudieron exportar las métricas: {error}", file=sys.stderr)
+        self.store.close()
+        self.history.close()
+        self.events.close()
+        if not self.history.writable:
+            self.session.close()  # Conexión con el daemon
+        if self.checkpoint is not None:
+            # Cierre normal: la próxima vez se empieza de cero, como siempre
+            self.checkpoint.clear()
+            self.checkpoint.close()
+        if self.audio is not None:
+            self.audio.close()
+        self.root.destroy()
 
     def apply_transparency(self):
         opacity = self.settings.get("transparency", 0.95)
-        self.root.attributes('-alpha', opacity)
+        if opacity != self.applied_alpha:
+            self.applied_alpha = opacity
+            self.root.attributes('-alpha', opacity)
 
     def play_alert_sound(self):
         if self.settings.get("alert_sound", True):
-            try:
-                # Reproducir el sonido en un hilo separado para no bloquear la interfaz
-                sound_thread = threading.Thread(
-                    target=lambda: winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-                )
-                sound_thread.start()
-            except Exception:
-                pass  # Si hay error al reproducir el sonido, lo ignoramos
+            # Se encola en el hilo de audio para no bloquear la interfaz
+            self.start_audio()
+            self.audio.play()
 
     def show_break_alert(self):
         # Actualizar la ventana flotante si existe
         self.update_floating_timer()
         
-        # Crear una nueva ventana de alerta
-        alert = ctk.CTkToplevel(self.root)
+        # La ventana de alerta se crea una vez y luego se oculta y se vuelve a
+        # mostrar (no modal: el descanso ya corre)
+        if self.break_alert is None:
+            self.build_break_alert()
+        self.view.set(self.break_alert_label, text=f"Tiempo de descanso: {self.break_time} minutos")
+        self.break_alert.deiconify()
+        self.break_alert.lift()
+        self.notifications.notify(
+            "¡Tiempo de descanso!",
+            f"Descanso de {self.break_time} minutos",
+            style="toast_warning"
+        )
+
+    def build_break_alert(self):
+        alert = self.break_alert = ctk.CTkToplevel(self.root)
+        alert.withdraw()
         alert.title("¡Tiempo de descanso!")
         alert.geometry("400x300")
+        alert.protocol("WM_DELETE_WINDOW", self.close_break_alert)
         
         # Configurar colores
         alert.configure(fg_color=self.settings["custom_colors"]["warning"])
@@ -658,35 +681,42 @@ class PomodoroApp:
         message.pack(pady=20)
         
         # Tiempo restante de descanso
-        time_label = ctk.CTkLabel(
+        self.break_alert_label = ctk.CTkLabel(
             alert,
-            text=f"Tiempo de descanso: {self.break_time} minutos",
+            text="",
             font=(self.settings["font_family"], 16),
             text_color=self.settings["custom_colors"]["text"]
         )
-        time_label.pack(pady=10)
+        self.break_alert_label.pack(pady=10)
         
         # Botón para cerrar
         close_button = ctk.CTkButton(
             alert,
             text="Entendido",
-            command=alert.destroy,
+            command=self.close_break_alert,
             fg_color=self.settings["custom_colors"]["accent"],
             text_color=self.settings["custom_colors"]["primary"]
         )
         close_button.pack(pady=20)
         
-        # Centrar la ventana
-        alert.lift()
-        alert.grab_set()
+        # Registrar la alerta para que siga los cambios de tema
+        self.theme.register(alert, "alert")
+        for widget, style in [(message, "label"), (self.break_alert_label, "label"), (close_button, "button")]:
+            self.theme.register(widget, style)
+
+    def close_break_alert(self):
+        if self.break_alert is not None:
+            self.break_alert.withdraw()
 
     def change_transparency(self, value):
-        self.settings["transparency"] = value
-        self.apply_transparency()
+        # El slider emite un evento por paso: se aplica una vez por cuadro
+        self.store.set("transparency", value)
+        self.input.submit("transparency", self.apply_transparency)
 
     def create_floating_timer(self):
-        # Crear ventana flotante
+        # La ventana flotante se construye una vez; al cerrarla sólo se oculta
         self.float_window = ctk.CTkToplevel(self.root)
+        self.float_window.withdraw()
         self.float_window.overrideredirect(True)  # Quitar bordes de la ventana
         self.float_window.geometry("250x100")
         self.float_window.attributes('-topmost', True)  # Mantener siempre visible
@@ -705,10 +735,12 @@ class PomodoroApp:
         self.float_title_label.pack(pady=(5, 0))
         
         # Etiqueta del temporizador
-        self.float_timer_label = ctk.CTkLabel(
+        self.float_timer_label = CountdownDisplay(
             float_frame,
             text=self.format_time(self.time_left),
-            font=(self.settings["font_family"], 36)
+            font=(self.settings["font_family"], 36),
+            text_color=self.settings["custom_colors"]["text"],
+            fg_color=self.settings["custom_colors"]["secondary"]
         )
         self.float_timer_label.pack(pady=5)
         
@@ -730,36 +762,55 @@ class PomodoroApp:
             fg_color=self.settings["custom_colors"]["secondary"],
             bg_color=self.settings["custom_colors"]["primary"]
         )
-        self.float_timer_label.configure(
-            text_color=self.settings["custom_colors"]["text"]
-        )
-        
         # Hacer la ventana draggable
+        self.theme.register(float_frame, "frame")
+        self.theme.register(self.float_title_label, "label")
+        self.theme.register(self.float_timer_label, "countdown")
+        
         float_frame.bind('<Button-1>', self.start_drag)
         float_frame.bind('<B1-Motion>', self.do_drag)
         
         # Mostrar/ocultar controles de transparencia al hacer doble clic
         float_frame.bind('<Double-Button-1>', self.toggle_transparency_controls)
+        self.track_visibility(self.float_window, "float")
+        # Versión compacta de los avisos: sólo el más reciente
+        self.float_toasts = ToastStack(self.float_window, self.notifications, self.theme,
+                                       self.settings["font_family"], compact=True)
         
         # Iniciar con una transparencia predeterminada
-        self.change_float_transparency(0.8)
+        self.apply_float_transparency(0.8)
 
     def change_float_transparency(self, value):
-        if hasattr(self, 'float_window'):
+        if self.float_window is not None:
+            self.input.submit("float_alpha", self.apply_float_transparency, value)
+
+    def apply_float_transparency(self, value):
+        if self.float_window is not None:
             self.float_window.attributes('-alpha', value)
 
     def start_drag(self, event):
-        self._drag_start_x = event.x
-        self._drag_start_y = event.y
+        # La posición de la ventana se consulta una sola vez al empezar; durante
+        # el arrastre se calcula con las coordenadas del puntero en la pantalla
+        if self.float_position is None:
+            self.float_position = (self.float_window.winfo_x(), self.float_window.winfo_y())
+        self._drag_origin = self.float_position
+        self._drag_start_x = event.x_root
+        self._drag_start_y = event.y_root
         
     def do_drag(self, event):
-        if hasattr(self, 'float_window'):
-            x = self.float_window.winfo_x() + (event.x - self._drag_start_x)
-            y = self.float_window.winfo_y() + (event.y - self._drag_start_y)
+        if self.float_shown:
+            x = self._drag_origin[0] + (event.x_root - self._drag_start_x)
+            y = self._drag_origin[1] + (event.y_root - self._drag_start_y)
+            self.float_position = (x, y)
+            self.input.submit("drag", self.move_float_window)
+
+    def move_float_window(self):
+        if self.float_window is not None:
+            x, y = self.float_position
             self.float_window.geometry(f"+{x}+{y}")
             
     def toggle_transparency_controls(self, event):
-        if hasattr(self, 'transparency_frame'):
+        if self.float_window is not None:
             if self.transparency_frame.winfo_manager():
                 self.transparency_frame.pack_forget()
                 self.float_window.geometry("250x100")
@@ -768,32 +819,106 @@ class PomodoroApp:
                 self.float_window.geometry("250x140")
 
     def toggle_float_window(self):
-        if hasattr(self, 'float_window'):
-            self.float_window.destroy()
-            delattr(self, 'float_window')
-            self.float_button.configure(text="🔲 Ventana flotante")
+        if self.float_shown:
+            self.hide_floating_timer()
+            self.view.set(self.float_button, text="🔲 Ventana flotante")
         else:
+            self.show_floating_timer()
+            self.view.set(self.float_button, text="✖️ Cerrar flotante")
+
+    def show_floating_timer(self):
+        if self.float_window is None:
             self.create_floating_timer()
-            self.float_button.configure(text="✖️ Cerrar flotante")
+        self.float_shown = True
+        self.update_floating_timer()
+        self.view.set(self.float_title_label, text=self.subject_entry.get() or "Estudiando...")
+        self.notifications.attach(self.float_toasts)
+        self.float_window.deiconify()
+
+    def hide_floating_timer(self):
+        self.float_shown = False
+        self.visible["float"] = False
+        self.notifications.detach(self.float_toasts)
+        self.float_window.withdraw()
 
     def update_floating_timer(self):
-        try:
-            if hasattr(self, 'float_window') and self.float_window.winfo_exists():
-                if hasattr(self, 'float_timer_label'):
-                    self.float_timer_label.configure(text=self.format_time(self.time_left))
-                if hasattr(self, 'float_title_label'):
-                    self.float_title_label.configure(text=self.subject_entry.get() or "Estudiando...")
-        except (tk.TclError, AttributeError):
-            # Si hay algún error con la ventana, la eliminamos completamente
-            if hasattr(self, 'float_window'):
-                delattr(self, 'float_window')
-            if hasattr(self, 'float_timer_label'):
-                delattr(self, 'float_timer_label')
-            if hasattr(self, 'float_title_label'):
-                delattr(self, 'float_title_label')
-            # Restaurar el estado del botón
-            self.float_button.configure(text="🔲 Ventana flotante")
+        # El título se actualiza en on_subject_changed, no en cada tick
+        if self.float_shown:
+            self.view.set(self.float_timer_label, text=self.format_time(self.time_left))
+
+def run_soak_mode(cycles):
+    # El historial y los ajustes de la prueba van a un directorio temporal
+    import tempfile
+    from soak import run_soak, virtual_time
+    os.environ["POMODORO_CONFIG_DIR"] = tempfile.mkdtemp(prefix="pomodoro-soak-")
+    clock, scheduler = virtual_time()
+    app = PomodoroApp(clock=clock.monotonic, wall_clock=clock.wall, scheduler=scheduler)
+    app.play_alert_sound = lambda: None
+    result = run_soak(app, scheduler, cycles)
+    app.on_close()
+    print(f"Crecimiento de widgets: {result['widget_growth']} · "
+          f"memoria: {result['traced_growth_kb']} KiB · "
+          f"sesiones completadas: {result['sessions_completed']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomodoro App")
+    parser.add_argument("--headless", action="store_true",
+                        help="ejecutar sólo el temporizador como daemon, sin ventana")
+    parser.add_argument("--connect", action="store_true",
+                        help="usar la interfaz como cliente de un daemon en ejecución")
+    parser.add_argument("--socket", default=None, help="ruta del socket del daemon")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="mostrar cuánto tarda cada etapa del arranque")
+    parser.add_argument("--soak", type=int, default=None, metavar="CICLOS",
+                        help="simular muchos ciclos y medir widgets y memoria (prueba de resistencia)")
+    parser.add_argument("--metrics", default=None, metavar="ARCHIVO",
+                        help="exportar métricas de diagnóstico (formato Prometheus) al cerrar")
+    commands = parser.add_mutually_exclusive_group()
+    commands.add_argument("--start", dest="command", action="store_const", const="start",
+                          help="iniciar el temporizador (en la instancia abierta, si la hay)")
+    commands.add_argument("--pause", dest="command", action="store_const", const="pause",
+                          help="pausar el temporizador de la instancia abierta")
+    commands.add_argument("--toggle-float", dest="command", action="store_const", const="toggle-float",
+                          help="mostrar u ocultar la ventana flotante de la instancia abierta")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        from pomodoro_daemon import serve
+        sys.exit(serve(args.socket))
+    if args.soak:
+        run_soak_mode(args.soak)
+        return
+
+    # Una sola ventana por usuario: si ya hay una, se le pasa el comando y
+    # se sale sin haber cargado la interfaz
+    from instance import SingleInstance, claim_or_forward
+    try:
+        instance = claim_or_forward(args.command or "show")
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    if instance is None:
+        return
+
+    # El historial tiene un solo escritor: esta ventana o un daemon. Si el
+    # daemon ya corre, la ventana se conecta a él en lugar de competir.
+    history_lock = SingleInstance("history")
+    socket_path = None
+    if args.connect or not history_lock.acquire():
+        from pomodoro_daemon import default_socket_path
+        socket_path = args.socket or default_socket_path()
+    profiler = StartupProfiler(origin=PROCESS_START) if args.profile_startup else None
+    if profiler:
+        profiler.mark("imports del módulo")
+    app = PomodoroApp(socket_path, profiler=profiler, metrics_path=args.metrics)
+    instance.set_handler(app.on_instance_command)
+    if args.command:
+        app.run_command(args.command)
+    try:
+        app.root.mainloop()
+    finally:
+        instance.release()
+        history_lock.release()
 
 if __name__ == "__main__":
-    app = PomodoroApp()
-    app.root.mainloop()
+    main()
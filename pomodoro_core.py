@@ -0,0 +1,185 @@
+import time
+from datetime import datetime
+
+from timer_engine import TimerEngine
+
+# Duraciones válidas en minutos (el checkpoint las guarda en 16 bits)
+MIN_MINUTES = 1
+MAX_MINUTES = 65535
+
+
+def check_minutes(value):
+    # Devuelve los minutos si son un entero válido; si no, ValueError
+    if isinstance(value, bool) or not isinstance(value, int) or not MIN_MINUTES <= value <= MAX_MINUTES:
+        raise ValueError(f"Duración inválida: {value!r} (debe ser entre {MIN_MINUTES} y {MAX_MINUTES} minutos)")
+    return value
+
+
+def start_from_fields(session, work_text, break_text):
+    # Botón Iniciar: los campos de duración son texto. ValueError si no son
+    # minutos válidos (la interfaz y simulation.py lo informan a su manera)
+    if not session.is_running:
+        session.start(work_time=int(work_text), break_time=int(break_text))
+
+
+def reset_from_field(session, work_text):
+    # Botón Reiniciar: la sesión avisa el nuevo tiempo a ambos temporizadores
+    session.reset(int(work_text))
+
+
+class PomodoroSession:
+    # Lógica del ciclo trabajo/descanso sin depender de Tk: inicio, pausa,
+    # reinicio, cambios de fase y conteo de sesiones. Cada cambio de estado se
+    # publica a los suscriptores como un evento con el mismo formato que se
+    # guarda en el historial.
+
+    def __init__(self, work_time=25, break_time=5, sessions_completed=0,
+                 clock=time.monotonic, wall_clock=datetime.now):
+        self.work_time = work_time
+        self.break_time = break_time
+        self.sessions_completed = sessions_completed
+        self.is_break = False
+        self.subject = ""
+        self.wall_clock = wall_clock
+        self.listeners = []
+        self.on_tick = None
+        # Mientras la fase no haya empezado, los cambios de duración la reinician
+        self.phase_started = False
+        self.timer = TimerEngine(work_time * 60, clock=clock, on_tick=self._tick)
+
+    @property
+    def phase(self):
+        return "break" if self.is_break else "work"
+
+    @property
+    def is_running(self):
+        return self.timer.is_running
+
+    def seconds_left(self):
+        return self.timer.seconds_left()
+
+    def phase_duration(self):
+        return (self.break_time if self.is_break else self.work_time) * 60
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def emit(self, event_type, **fields):
+        event = {
+            "type": event_type,
+            "phase": self.phase,
+            "ts": self.wall_clock().isoformat(timespec="seconds")
+        }
+        event.update(fields)
+        for listener in list(self.listeners):
+            listener(event)
+        return event
+
+    def state(self):
+        return {
+            "phase": self.phase,
+            "running": self.is_running,
+            "remaining": self.timer.remaining(),
+            "work_time": self.work_time,
+            "break_time": self.break_time,
+            "sessions_completed": self.sessions_completed,
+            "subject": self.subject
+        }
+
+    def set_durations(self, work_time=None, break_time=None):
+        # Se validan ambas antes de cambiar nada
+        if work_time is not None:
+            check_minutes(work_time)
+        if break_time is not None:
+            check_minutes(break_time)
+        if work_time is not None:
+            self.work_time = work_time
+        if break_time is not None:
+            self.break_time = break_time
+        if not self.phase_started:
+            self.timer.reset(self.phase_duration())
+
+    def set_subject(self, subject):
+        self.subject = subject
+
+    def start(self, work_time=None, break_time=None):
+        if self.is_running:
+            return
+        self.set_durations(work_time, break_time)
+        self.phase_started = True
+        self.timer.start()
+        self.emit(
+            "start",
+            work_time=self.work_time,
+            break_time=self.break_time,
+            remaining=self.seconds_left(),
+            subject=self.subject
+        )
+
+    def pause(self):
+        if self.is_running:
+            self.timer.pause()
+            self.emit("pause", remaining=self.seconds_left())
+
+    def reset(self, work_time=None):
+        if work_time is not None:
+            check_minutes(work_time)
+        self.pause()
+        if work_time is not None:
+            self.work_time = work_time
+        self.is_break = False
+        self.phase_started = False
+        self.timer.reset(self.work_time * 60)
+        self.emit("reset")
+
+    def restore(self, is_break, remaining, running, work_time, break_time, subject=""):
+        # Retoma una fase interrumpida (ver checkpoint.py) en el punto guardado
+        self.work_time = work_time
+        self.break_time = break_time
+        self.is_break = is_break
+        self.subject = subject
+        self.phase_started = True
+        self.timer.reset(self.phase_duration())
+        self.timer.set_remaining(remaining)
+        if running:
+            self.start()
+
+    def time_to_next_change(self):
+        return self.timer.time_to_next_change()
+
+    def time_to_deadline(self):
+        # Segundos hasta el fin de la fase actual (None si está en pausa)
+        return self.timer.remaining() if self.is_running else None
+
+    def deadline(self):
+        return self.timer.deadline
+
+    def poll(self):
+        # Devuelve True si en esta llamada terminó una fase
+        if self.timer.poll():
+            self.finish_phase()
+            return True
+        return False
+
+    def finish_phase(self):
+        # La duración con la que corrió la fase: si se editaron los tiempos a
+        # mitad de fase, los nuevos valen recién desde la siguiente
+        minutes = self.timer.duration // 60
+        if not self.is_break:
+            self.sessions_completed += 1
+        self.emit("complete", minutes=minutes, subject=self.subject)
+
+        # Pasar a la siguiente fase y arrancarla automáticamente
+        self.is_break = not self.is_break
+        self.phase_started = False
+        self.timer.reset(self.phase_duration())
+        self.emit("phase")
+        self.start()
+
+    def _tick(self, seconds):
+        if self.on_tick:
+            self.on_tick(seconds)
@@ -0,0 +1,401 @@
+import argparse
+import asyncio
+import getpass
+import json
+import os
+import queue
+import socket
+import sys
+import tempfile
+import threading
+
+from checkpoint import Checkpoint, restore
+from event_bus import EventBus, load_hooks
+from pomodoro_core import PomodoroSession, check_minutes
+from session_log import SessionHistory
+from timer_engine import TimerEngine
+
+# Intervalo con el que un cliente gráfico revisa los mensajes del daemon
+REMOTE_POLL_INTERVAL = 0.25
+
+
+def default_socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"pomodoro-{getpass.getuser()}.sock")
+
+
+def minutes_field(request, key):
+    # Minutos de una petición: enteros (o texto con un entero) entre 1 y
+    # MAX_MINUTES; cualquier otra cosa es ValueError y la petición se rechaza
+    value = request.get(key)
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = int(value.strip())
+        except ValueError:
+            raise ValueError(f"{key} debe ser un número entero de minutos") from None
+    elif isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return check_minutes(value)
+
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class TimerDaemon:
+    # Daemon sin interfaz gráfica: una PomodoroSession controlada por un
+    # socket Unix con un protocolo de líneas JSON. Cada petición lleva un
+    # "cmd" y recibe una respuesta con el estado; "subscribe" además deja la
+    # conexión abierta para recibir cada evento de la sesión.
+
+    def __init__(self, socket_path=None, history=None, events=None, checkpoint=None):
+        self.socket_path = socket_path or default_socket_path()
+        self.history = history if history is not None else SessionHistory()
+        self.events = events if events is not None else EventBus()
+        state = self.history.load()
+        self.session = PomodoroSession(
+            work_time=state["work_time"],
+            break_time=state["break_time"],
+            sessions_completed=self.history.sessions_today()
+        )
+        self.session.subscribe(self.on_event)
+        self.session.subscribe(self.events.on_session_event)
+        # Retomar la fase que quedó a medias si el daemon murió de golpe
+        self.checkpoint = checkpoint
+        if checkpoint is not None:
+            self.session.subscribe(self.save_checkpoint)
+            restore(self.session, checkpoint.open())
+        self.subscribers = set()
+        self.clients = {}
+        self.wake = None
+        self.stopped = None
+
+    def on_event(self, event):
+        self.history.record(event)
+        self.broadcast({"event": event, "state": self.session.state()})
+
+    def save_checkpoint(self, event=None):
+        self.checkpoint.save(self.session)
+
+    def broadcast(self, message):
+        data = encode(message)
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.subscribers.discard(writer)
+            else:
+                writer.write(data)
+
+    def dispatch(self, request, writer):
+        cmd = request.get("cmd")
+        if cmd == "start":
+            self.session.start(minutes_field(request, "work_time"), minutes_field(request, "break_time"))
+        elif cmd == "pause":
+            self.session.pause()
+        elif cmd == "reset":
+            self.session.reset(minutes_field(request, "work_time"))
+        elif cmd == "set_durations":
+            self.session.set_durations(minutes_field(request, "work_time"), minutes_field(request, "break_time"))
+        elif cmd == "set_subject":
+            subject = request.get("subject", "")
+            if not isinstance(subject, str):
+                raise ValueError("subject debe ser un texto")
+            self.session.set_subject(subject)
+            if self.checkpoint is not None:
+                self.save_checkpoint()
+        elif cmd == "subscribe":
+            self.subscribers.add(writer)
+        elif cmd == "shutdown":
+            self.stopped.set()
+        elif cmd != "state":
+            raise ValueError(f"Comando desconocido: {cmd}")
+        # Cualquier comando puede mover la fecha límite del temporizador
+        self.wake.set()
+        return self.session.state()
+
+    async def handle_client(self, reader, writer):
+        self.clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = {}
+                try:
+                    message = json.loads(line)
+                    response = {"ok": True, "state": self.dispatch(message, writer)}
+                except (ValueError, TypeError, AttributeError) as error:
+                    response = {"ok": False, "error": str(error)}
+                except Exception as error:
+                    # Un error inesperado no debe cortar la conexión ni el daemon
+                    print(f"[daemon] error al atender {message!r}: {error!r}", file=sys.stderr)
+                    response = {"ok": False, "error": f"error interno: {error}"}
+                if isinstance(message, dict) and "id" in message:
+                    response["id"] = message["id"]
+                writer.write(encode(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            self.clients.pop(writer, None)
+            writer.close()
+
+    async def run_timer(self):
+        # Sólo despierta en la fecha límite de la fase o cuando llega un comando.
+        # Termina al marcar `stopped`: en Python 3.11 wait_for() puede tragarse
+        # un cancel() que llega justo cuando el evento ya se disparó
+        while not self.stopped.is_set():
+            delay = self.session.time_to_deadline()
+            try:
+                await asyncio.wait_for(self.wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            self.session.poll()
+
+    async def serve(self):
+        self.wake = asyncio.Event()
+        self.stopped = asyncio.Event()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Socket de una ejecución anterior
+        server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        timer_task = asyncio.create_task(self.run_timer())
+        try:
+            await self.stopped.wait()
+        finally:
+            # wait_closed() espera a que terminen todas las conexiones: primero
+            # se dejan de aceptar clientes y se cortan los que siguen abiertos
+            # (incluido el que pidió el shutdown)
+            server.close()
+            self.stopped.set()
+            self.wake.set()
+            tasks = list(self.clients.values())
+            for writer in list(self.clients):
+                writer.close()
+            await asyncio.gather(timer_task, *tasks, return_exceptions=True)
+            await server.wait_closed()
+            # Cada paso del cierre se intenta aunque falle el anterior: el
+            # historial se cierra (y se guarda su snapshot) siempre
+            for step in (self.session.pause, self.history.close, self.events.close,
+                         self.close_checkpoint, self.remove_socket):
+                try:
+                    step()
+                except Exception as error:
+                    print(f"[daemon] error al cerrar ({step.__name__}): {error!r}", file=sys.stderr)
+
+    def close_checkpoint(self):
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+            self.checkpoint.close()
+
+    def remove_socket(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def request(cmd, socket_path=None, **fields):
+    # Cliente mínimo: envía un comando y devuelve la respuesta del daemon
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path or default_socket_path())
+        sock.sendall(encode(dict(fields, cmd=cmd)))
+        return json.loads(sock.makefile("r", encoding="utf-8").readline())
+
+
+class RemoteSession:
+    # Misma interfaz que PomodoroSession, pero el estado vive en el daemon.
+    # Un hilo lee los mensajes del socket y poll() los aplica desde el hilo de
+    # Tk; un TimerEngine local sigue la cuenta regresiva entre mensajes.
+
+    def __init__(self, socket_path=None):
+        self.work_time = 25
+        self.break_time = 5
+        self.sessions_completed = 0
+        self.is_break = False
+        self.subject = ""
+        self.listeners = []
+        self.on_tick = None
+        self.timer = TimerEngine(self.work_time * 60, on_tick=self._tick)
+        self.messages = queue.Queue()
+        self.connected = True
+        self._lock = threading.Lock()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path or default_socket_path())
+        self.send("subscribe")
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    @property
+    def phase(self):
+        return "break" if self.is_break else "work"
+
+    @property
+    def is_running(self):
+        return self.timer.is_running
+
+    def seconds_left(self):
+        return self.timer.seconds_left()
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def send(self, cmd, **fields):
+        # Sin daemon los comandos se descartan: la interfaz ya avisó del corte
+        if not self.connected:
+            return
+        try:
+            self.sock.sendall(encode(dict(fields, cmd=cmd)))
+        except OSError:
+            self._disconnect()
+
+    def _disconnect(self, notify=True):
+        # Desde send() o desde el hilo lector; poll() publica el evento
+        # "disconnected" en el hilo de Tk una sola vez
+        with self._lock:
+            was_connected, self.connected = self.connected, False
+        if was_connected and notify:
+            self.messages.put({"event": {"type": "disconnected"}})
+
+    def start(self, work_time=None, break_time=None):
+        self._check(work_time, break_time)
+        self.send("start", work_time=work_time, break_time=break_time)
+
+    def pause(self):
+        self.send("pause")
+
+    def reset(self, work_time=None):
+        self._check(work_time)
+        self.send("reset", work_time=work_time)
+
+    def set_durations(self, work_time=None, break_time=None):
+        self._check(work_time, break_time)
+        self.send("set_durations", work_time=work_time, break_time=break_time)
+
+    def _check(self, *durations):
+        # Mismo ValueError que una sesión local, antes de enviar nada
+        for minutes in durations:
+            if minutes is not None:
+                check_minutes(minutes)
+
+    def set_subject(self, subject):
+        self.subject = subject
+        self.send("set_subject", subject=subject)
+
+    def time_to_next_change(self):
+        # Hay que seguir revisando el socket aunque el temporizador esté en pausa
+        delay = self.timer.time_to_next_change()
+        return REMOTE_POLL_INTERVAL if delay is None else min(delay, REMOTE_POLL_INTERVAL)
+
+    def time_to_deadline(self):
+        return self.timer.remaining() if self.is_running else None
+
+    def poll(self):
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if "state" in message:
+                self._sync(message["state"])
+            if message.get("event", {}).get("type") == "disconnected":
+                self.timer.pause()
+            if "event" in message:
+                for listener in list(self.listeners):
+                    listener(message["event"])
+        # La fase la termina el daemon; aquí sólo se actualiza la pantalla
+        self.timer.poll()
+        return False
+
+    def close(self):
+        self._disconnect(notify=False)
+        self.sock.close()
+
+    def _sync(self, state):
+        self.work_time = state["work_time"]
+        self.break_time = state["break_time"]
+        self.sessions_completed = state["sessions_completed"]
+        self.is_break = state["phase"] == "break"
+        self.timer.pause()
+        self.timer.set_remaining(state["remaining"])
+        if state["running"]:
+            self.timer.start()
+
+    def _read(self):
+        try:
+            for line in self.sock.makefile("r", encoding="utf-8"):
+                self.messages.put(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        # El daemon se cerró o murió (o close() cortó el socket)
+        self._disconnect()
+
+    def _tick(self, seconds):
+        if self.on_tick:
+            self.on_tick(seconds)
+
+
+def serve(socket_path=None):
+    from instance import SingleInstance
+    from settings_store import SettingsStore
+    # El historial tiene un solo escritor: otro daemon o una ventana local
+    history_lock = SingleInstance("history")
+    if not history_lock.acquire():
+        print("Ya hay un daemon o una ventana de Pomodoro usando el historial", file=sys.stderr)
+        return 1
+    events = EventBus()
+    load_hooks(events, SettingsStore(writable=False).load()["hooks"])
+    daemon = TimerDaemon(socket_path, events=events, checkpoint=Checkpoint())
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        history_lock.release()
+    return 0
+
+
+def watch(socket_path=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path or default_socket_path())
+        sock.sendall(encode({"cmd": "subscribe"}))
+        for line in sock.makefile("r", encoding="utf-8"):
+            print(line.strip(), flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Temporizador Pomodoro sin interfaz gráfica")
+    parser.add_argument(
+        "command",
+        choices=["serve", "status", "start", "pause", "reset", "watch", "shutdown"],
+        help="serve inicia el daemon; el resto se envía al daemon en ejecución"
+    )
+    parser.add_argument("--socket", default=None, help="ruta del socket Unix")
+    parser.add_argument("--work", type=int, default=None, help="minutos de trabajo")
+    parser.add_argument("--break", dest="break_time", type=int, default=None, help="minutos de descanso")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        return serve(args.socket)
+    try:
+        if args.command == "watch":
+            watch(args.socket)
+            return 0
+        cmd = "state" if args.command == "status" else args.command
+        response = request(cmd, args.socket, work_time=args.work, break_time=args.break_time)
+    except (ConnectionError, FileNotFoundError):
+        print("No hay un daemon de Pomodoro en ejecución", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    print(json.dumps(response, ensure_ascii=False, indent=2))
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
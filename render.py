@@ -0,0 +1,77 @@
+import tkinter as tk
+
+
+class ViewRenderer:
+    # Capa de renderizado con verificación de cambios: recuerda lo último que
+    # mostró cada widget y sólo llama a configure() con las opciones que
+    # realmente cambiaron, agrupando todas las actualizaciones en un único
+    # callback por cuadro (after_idle).
+
+    def __init__(self, root):
+        self.root = root
+        self.applied = {}
+        self.pending = {}
+        self.flush_id = None
+        self.configure_calls = 0
+
+    def set(self, widget, **options):
+        self.pending.setdefault(widget, {}).update(options)
+        if self.flush_id is None:
+            self.flush_id = self.root.after_idle(self.flush)
+
+    def flush(self):
+        self.flush_id = None
+        pending, self.pending = self.pending, {}
+        for widget, options in pending.items():
+            applied = self.applied.setdefault(widget, {})
+            changes = {
+                key: value for key, value in options.items()
+                if key not in applied or applied[key] != value
+            }
+            if not changes:
+                continue
+            try:
+                widget.configure(**changes)
+            except tk.TclError:
+                # El widget ya no existe (por ejemplo, se cerró la ventana flotante)
+                self.forget(widget)
+                continue
+            self.configure_calls += 1
+            applied.update(changes)
+
+    def forget(self, widget):
+        self.applied.pop(widget, None)
+        self.pending.pop(widget, None)
+
+
+class InputCoalescer:
+    # Agrupa ráfagas de eventos de entrada (arrastres, sliders) para aplicar
+    # como mucho una actualización por cuadro: cada evento sólo guarda su
+    # último valor por clave y un único callback diferido aplica lo acumulado.
+
+    def __init__(self, root, frame_ms=16):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.pending = {}
+        self.flush_id = None
+        self.submitted = 0
+        self.applied = 0
+
+    def submit(self, key, callback, *args):
+        self.pending[key] = (callback, args)
+        self.submitted += 1
+        if self.flush_id is None:
+            self.flush_id = self.root.after(self.frame_ms, self.flush)
+
+    def cancel(self, key):
+        self.pending.pop(key, None)
+
+    def flush(self):
+        self.flush_id = None
+        pending, self.pending = self.pending, {}
+        for callback, args in pending.values():
+            try:
+                callback(*args)
+            except tk.TclError:
+                continue  # La ventana se cerró antes de aplicar el cambio
+            self.applied += 1
@@ -0,0 +1,142 @@
+import heapq
+import itertools
+import threading
+import time
+
+from pomodoro_core import PomodoroSession
+
+
+class TimerScheduler:
+    # Cola de prioridad (montículo) de fechas límite. Programar o reprogramar
+    # cuesta O(log n); las entradas reemplazadas o canceladas se descartan
+    # al llegar a la cima del montículo en lugar de buscarlas.
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.heap = []
+        self.entries = {}   # clave -> número de secuencia vigente
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def schedule(self, key, deadline, callback):
+        seq = next(self.counter)
+        self.entries[key] = seq
+        heapq.heappush(self.heap, (deadline, seq, key, callback))
+
+    def cancel(self, key):
+        self.entries.pop(key, None)
+
+    def _discard_stale(self):
+        while self.heap and self.entries.get(self.heap[0][2]) != self.heap[0][1]:
+            heapq.heappop(self.heap)
+
+    def next_deadline(self):
+        self._discard_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def run_due(self, now=None):
+        # Ejecuta las entradas vencidas y devuelve cuántas se ejecutaron
+        now = self.clock() if now is None else now
+        fired = 0
+        while True:
+            self._discard_stale()
+            if not self.heap or self.heap[0][0] > now:
+                return fired
+            _, _, key, callback = heapq.heappop(self.heap)
+            del self.entries[key]
+            callback()
+            fired += 1
+
+
+class SessionPool:
+    # Muchas PomodoroSession independientes (una por usuario o miembro del
+    # equipo) en un solo proceso. Nadie revisa los temporizadores cada
+    # segundo: sólo se despierta en la próxima fecha límite de fase.
+    # Mientras run() corre en otro hilo, las sesiones se controlan con
+    # start/pause/reset del pool (toman el candado), no directamente.
+
+    def __init__(self, clock=time.monotonic, wall_clock=None):
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.scheduler = TimerScheduler(clock)
+        self.sessions = {}
+        self.wakeups = 0
+        self.condition = threading.Condition()
+        self.stopped = False
+
+    def add(self, name, work_time=25, break_time=5):
+        options = {"wall_clock": self.wall_clock} if self.wall_clock else {}
+        session = PomodoroSession(work_time, break_time, clock=self.clock, **options)
+        session.subscribe(lambda event, n=name: self._reschedule(n))
+        with self.condition:
+            self.sessions[name] = session
+        return session
+
+    def remove(self, name):
+        with self.condition:
+            self.scheduler.cancel(name)
+            return self.sessions.pop(name, None)
+
+    def start(self, name):
+        with self.condition:
+            self.sessions[name].start()
+
+    def pause(self, name):
+        with self.condition:
+            self.sessions[name].pause()
+
+    def reset(self, name, work_time=None):
+        with self.condition:
+            self.sessions[name].reset(work_time)
+
+    def __getitem__(self, name):
+        return self.sessions[name]
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def _reschedule(self, name):
+        # Se llama con cada evento de la sesión (inicio, pausa, reinicio, fase)
+        session = self.sessions.get(name)
+        if session is None:
+            return
+        deadline = session.deadline()
+        with self.condition:
+            if deadline is None:
+                self.scheduler.cancel(name)
+            else:
+                self.scheduler.schedule(name, deadline, lambda: self._fire(name))
+            self.condition.notify()
+
+    def _fire(self, name):
+        session = self.sessions.get(name)
+        if session is not None and not session.poll() and session.is_running:
+            # Despertó antes de tiempo (p. ej. por redondeo): volver a programar
+            self._reschedule(name)
+
+    def run_due(self, now=None):
+        with self.condition:
+            return self.scheduler.run_due(now)
+
+    def time_to_next_deadline(self):
+        with self.condition:
+            deadline = self.scheduler.next_deadline()
+        return None if deadline is None else max(0.0, deadline - self.clock())
+
+    def run(self):
+        # Bucle bloqueante: duerme hasta la próxima fecha límite o hasta que
+        # una sesión cambie de estado
+        with self.condition:
+            while not self.stopped:
+                deadline = self.scheduler.next_deadline()
+                timeout = None if deadline is None else max(0.0, deadline - self.clock())
+                self.condition.wait(timeout)
+                self.wakeups += 1
+                self.scheduler.run_due()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
@@ -0,0 +1,258 @@
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+from paths import config_path
+from pomodoro_core import check_minutes
+from stats import StatsIndex
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_PATTERN = "segment-{:06d}.jsonl"
+
+
+def default_state():
+    return {
+        "work_time": 25,
+        "break_time": 5,
+        "day": None,
+        "sessions_completed": 0
+    }
+
+
+def apply_event(state, event):
+    # Reduce un evento del historial sobre el estado del día
+    event_type = event.get("type")
+    if event_type == "start":
+        state["work_time"] = event.get("work_time", state["work_time"])
+        state["break_time"] = event.get("break_time", state["break_time"])
+    elif event_type == "complete" and event.get("phase") == "work":
+        day = event["ts"][:10]
+        if state["day"] != day:
+            state["day"] = day
+            state["sessions_completed"] = 0
+        state["sessions_completed"] += 1
+    return state
+
+
+def write_text_atomic(path, text):
+    # Escribir en un archivo temporal y renombrarlo para no dejarlo a medias
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_json_atomic(path, data):
+    write_text_atomic(path, json.dumps(data))
+
+
+class SessionLog:
+    # Historial de eventos en modo sólo-anexar. Cada inicio, pausa, sesión
+    # completada o cambio de fase es una línea JSON; las escrituras se agrupan
+    # y se vuelcan desde un hilo en segundo plano. Cada cierto número de eventos
+    # se guarda un snapshot del estado y se empieza un segmento nuevo, así al
+    # cargar sólo hace falta leer el snapshot y la cola del último segmento.
+    # Los segmentos anteriores se conservan como historial completo.
+
+    def __init__(self, directory=None, flush_interval=1.0, compact_every=500):
+        # Por defecto en el directorio de configuración del usuario; el
+        # antiguo pomodoro_history del directorio actual se mueve allí
+        self.directory = directory or config_path("history", legacy="pomodoro_history")
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.segment = 1
+        self.events_since_snapshot = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._file = None
+        self._thread = None
+
+    def load(self):
+        # Devuelve (estado del snapshot, eventos posteriores al snapshot)
+        os.makedirs(self.directory, exist_ok=True)
+        state = None
+        try:
+            with open(os.path.join(self.directory, SNAPSHOT_FILE), "r") as f:
+                snapshot = json.load(f)
+                state = snapshot["state"]
+                self.segment = snapshot["segment"]
+        except (FileNotFoundError, ValueError, KeyError):
+            self.segment = self._last_segment()
+
+        events = []
+        try:
+            with open(self._segment_path(self.segment), "r") as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        # Línea incompleta por un cierre abrupto: se descarta
+                        continue
+        except FileNotFoundError:
+            pass
+        self.events_since_snapshot = len(events)
+        return state, events
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def append(self, event):
+        event.setdefault("ts", datetime.now().isoformat(timespec="seconds"))
+        self._queue.put(("event", event))
+        self.events_since_snapshot += 1
+        return event
+
+    def needs_compaction(self):
+        return self.events_since_snapshot >= self.compact_every
+
+    def compact(self, state):
+        # El snapshot se escribe en el hilo de fondo después de los eventos
+        # pendientes, por lo que siempre corresponde a todo lo anterior
+        self._queue.put(("snapshot", json.loads(json.dumps(state))))
+        self.events_since_snapshot = 0
+
+    def flush(self):
+        with self._lock:
+            self._drain()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            with self._lock:
+                self._drain()
+
+    def _drain(self):
+        lines = []
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "event":
+                lines.append(json.dumps(payload, ensure_ascii=False) + "\n")
+            else:
+                self._write_lines(lines)
+                lines = []
+                self._rotate(payload)
+        self._write_lines(lines)
+
+    def _write_lines(self, lines):
+        if not lines:
+            return
+        if self._file is None:
+            self._file = open(self._segment_path(self.segment), "a", encoding="utf-8")
+        self._file.write("".join(lines))
+        self._file.flush()
+
+    def _rotate(self, state):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.segment += 1
+        write_json_atomic(
+            os.path.join(self.directory, SNAPSHOT_FILE),
+            {"segment": self.segment, "state": state}
+        )
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, SEGMENT_PATTERN.format(segment))
+
+    def _last_segment(self):
+        segments = [
+            int(name[8:14]) for name in os.listdir(self.directory)
+            if name.startswith("segment-") and name.endswith(".jsonl")
+        ]
+        # Sin snapshot hay que empezar desde el primer segmento existente
+        return min(segments) if segments else 1
+
+
+def load_legacy_settings(path="pomodoro_settings.json"):
+    # Migrar el antiguo pomodoro_settings.json la primera vez
+    state = default_state()
+    try:
+        with open(path, "r") as f:
+            settings = json.load(f)
+            state["work_time"] = settings["work_time"]
+            state["break_time"] = settings["break_time"]
+            state["day"] = settings["last_date"]
+            state["sessions_completed"] = settings["sessions_completed"]
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    return state
+
+
+class SessionHistory:
+    # Historial completo de un temporizador: el registro en disco, el estado
+    # del día y el índice de estadísticas, alimentados por los mismos eventos
+
+    def __init__(self, log=None, writable=True):
+        self.log = log if log is not None else SessionLog()
+        # Un cliente de solo lectura (p. ej. la interfaz conectada al daemon)
+        # nunca escribe: el daemon es el único dueño del historial
+        self.writable = writable
+        self.state = default_state()
+        self.stats = StatsIndex()
+
+    def load(self):
+        state, events = self.log.load()
+        if state is None:
+            state = load_legacy_settings()
+        self.stats = StatsIndex.from_dict(state.pop("stats", None))
+        self.state = state
+        for event in events:
+            self.apply(event)
+        # Versiones anteriores aceptaban duraciones fuera de rango (p. ej. 0):
+        # se vuelve a las de por omisión en lugar de fallar en cada arranque
+        defaults = default_state()
+        for key in ("work_time", "break_time"):
+            try:
+                check_minutes(self.state.get(key))
+            except ValueError:
+                self.state[key] = defaults[key]
+        if self.writable:
+            self.log.start()
+        return self.state
+
+    def sessions_today(self):
+        if self.state["day"] == datetime.now().strftime("%Y-%m-%d"):
+            return self.state["sessions_completed"]
+        return 0
+
+    def apply(self, event):
+        apply_event(self.state, event)
+        self.stats.apply(event)
+
+    def record(self, event):
+        # Cada evento se anexa al historial; el estado del día se actualiza
+        # en memoria con el mismo reductor que se usa al cargar
+        self.apply(event)
+        if not self.writable:
+            return
+        self.log.append(dict(event))
+        if self.log.needs_compaction():
+            self.compact()
+
+    def compact(self):
+        # Compactar el historial en un snapshot del estado actual
+        self.log.compact(dict(self.state, stats=self.stats.to_dict()))
+
+    def close(self):
+        if self.writable:
+            self.compact()
+            self.log.close()
@@ -0,0 +1,244 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+
+from event_bus import EVENTS as HOOK_EVENTS
+from paths import config_path
+from session_log import write_text_atomic
+
+SETTINGS_FILE = "settings.json"
+LEGACY_VISUAL_SETTINGS = "pomodoro_visual_settings.json"
+SCHEMA_VERSION = 1
+
+DEFAULT_SETTINGS = {
+    "theme": "dark",
+    "color_theme": "blue",
+    "font_family": "Helvetica",
+    "font_size": 24,
+    "custom_colors": {
+        "primary": "#1A1B26",        # Fondo principal (azul oscuro)
+        "secondary": "#24283B",      # Fondo secundario (azul medio)
+        "accent": "#7AA2F7",         # Acento (azul brillante)
+        "text": "#A9B1D6",          # Texto principal (gris claro)
+        "warning": "#F7768E"         # Alertas (rosa)
+    },
+    "transparency": 0.97,            # Transparencia de los widgets
+    "alert_sound": True,             # Sonido de alerta activado/desactivado
+    "hooks": []                      # Comandos a ejecutar en cada cambio de fase (ver event_bus.py)
+}
+
+HEX_COLOR = re.compile(r"^#[0-9A-Fa-f]{6}$")
+
+
+def _number(low, high, kind):
+    def check(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and low <= value <= high
+    return lambda value: kind(value) if check(value) else None
+
+
+def _choice(*options):
+    return lambda value: value if value in options else None
+
+
+def _string(value):
+    return value if isinstance(value, str) and value.strip() else None
+
+
+def _boolean(value):
+    return value if isinstance(value, bool) else None
+
+
+def _colors(value):
+    if not isinstance(value, dict):
+        return None
+    colors = dict(DEFAULT_SETTINGS["custom_colors"])
+    for key in colors:
+        color = value.get(key)
+        if isinstance(color, str) and HEX_COLOR.match(color):
+            colors[key] = color
+    return colors
+
+
+def _hooks(value):
+    # Lista de {"command": [...], "events": [...], "timeout": segundos}
+    if not isinstance(value, list):
+        return None
+    hooks = []
+    for entry in value:
+        if not isinstance(entry, dict):
+            continue
+        command = entry.get("command")
+        if not (isinstance(command, list) and command and all(isinstance(arg, str) for arg in command)):
+            continue
+        hook = {"command": command}
+        events = entry.get("events")
+        if isinstance(events, list):
+            hook["events"] = [name for name in events if name in HOOK_EVENTS]
+        timeout = entry.get("timeout")
+        if isinstance(timeout, (int, float)) and not isinstance(timeout, bool) and 0 < timeout <= 300:
+            hook["timeout"] = timeout
+        hooks.append(hook)
+    return hooks
+
+
+# Cada clave conocida con su validador: devuelve el valor normalizado o None
+SCHEMA = {
+    "theme": _choice("dark", "light", "system"),
+    "color_theme": _choice("blue", "green", "dark-blue"),
+    "font_family": _string,
+    "font_size": _number(6, 200, int),
+    "custom_colors": _colors,
+    "transparency": _number(0.1, 1.0, float),
+    "alert_sound": _boolean,
+    "hooks": _hooks
+}
+
+
+def migrate(data):
+    # Las versiones anteriores se llevan al esquema actual paso a paso.
+    # Versión 0: pomodoro_visual_settings.json, sin número de versión.
+    version = data.get("version", 0)
+    if version < 1:
+        data = dict(data, version=1)
+    return data
+
+
+def validate(data):
+    # Los valores inválidos o desconocidos se reemplazan por los predeterminados
+    settings = copy.deepcopy(DEFAULT_SETTINGS)
+    for key, check in SCHEMA.items():
+        if key in data:
+            value = check(data[key])
+            if value is not None:
+                settings[key] = value
+    return settings
+
+
+class SettingsStore:
+    # Todos los ajustes de la app en un único archivo versionado dentro del
+    # directorio de configuración del usuario. Se leen una vez y se mantienen
+    # en memoria; los cambios seguidos (arrastrar un slider, elegir colores)
+    # se agrupan y se escriben en un solo reemplazo atómico cuando pasan
+    # `delay` segundos sin cambios (o como mucho cada `max_delay`).
+    # Sólo la instancia de la interfaz escribe; el daemon los abre con
+    # writable=False para no pisar lo que guarde ella.
+
+    def __init__(self, path=None, delay=0.5, max_delay=2.0, clock=time.monotonic, writable=True):
+        self.path = path or config_path(SETTINGS_FILE)
+        self.writable = writable
+        self.clock = clock
+        self.delay = delay
+        self.max_delay = max_delay
+        self.data = copy.deepcopy(DEFAULT_SETTINGS)
+        self.writes = 0
+        self._pending = None        # texto JSON aún no escrito
+        self._first_change = None
+        self._last_change = None
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._stopped = False
+        self._thread = None
+
+    def load(self):
+        # Devuelve el diccionario de ajustes en memoria; la app lo modifica
+        # directamente y avisa con changed()
+        raw = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            # Archivo dañado: se aparta para poder revisarlo y se usan los predeterminados
+            if self.writable:
+                os.replace(self.path, self.path + ".invalid")
+        if raw is None:
+            raw = self._load_legacy()
+        if not isinstance(raw, dict):
+            raw = {}
+        self.data.clear()
+        self.data.update(validate(migrate(raw)))
+        if raw.get("version") != SCHEMA_VERSION and self.writable:
+            # Primera ejecución o versión anterior: guardar ya el formato nuevo
+            self._pending = self._serialize()
+            self.flush()
+        return self.data
+
+    def _load_legacy(self):
+        try:
+            with open(LEGACY_VISUAL_SETTINGS, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def set(self, key, value):
+        self.data[key] = value
+        self.changed()
+
+    def update(self, values):
+        self.data.update(values)
+        self.changed()
+
+    def changed(self):
+        if not self.writable:
+            return
+        # Se serializa ahora, en el hilo que modificó los ajustes, para que el
+        # hilo de escritura nunca lea el diccionario mientras cambia
+        text = self._serialize()
+        with self._condition:
+            now = self.clock()
+            self._pending = text
+            self._last_change = now
+            if self._first_change is None:
+                self._first_change = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _serialize(self):
+        return json.dumps(dict(self.data, version=SCHEMA_VERSION), ensure_ascii=False, indent=2)
+
+    def flush(self):
+        with self._write_lock:
+            with self._condition:
+                text, self._pending, self._first_change = self._pending, None, None
+            if text is not None:
+                write_text_atomic(self.path, text)
+                self.writes += 1
+
+    def close(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        # Hilo de escritura: espera a que los cambios se calmen. La escritura
+        # se hace fuera del candado para que changed() nunca espere al disco.
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if self._pending is None:
+                        self._condition.wait()
+                        continue
+                    now = self.clock()
+                    due = min(self._last_change + self.delay, self._first_change + self.max_delay)
+                    if now >= due:
+                        break
+                    self._condition.wait(due - now)
+                if self._stopped:
+                    return
+            self.flush()
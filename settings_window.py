@@ -0,0 +1,281 @@
+import tkinter as tk
+
+import customtkinter as ctk
+
+from font_picker import VirtualFontList
+
+COLOR_OPTIONS = [
+    ("Color principal", "primary"),
+    ("Color secundario", "secondary"),
+    ("Color de acento", "accent"),
+    ("Color de texto", "text"),
+    ("Color de alerta", "warning")
+]
+
+
+class SettingsWindow:
+    # Ventana de ajustes que se construye una sola vez. Al cerrarla se oculta
+    # y al reabrirla sus controles se sincronizan con app.settings. Las
+    # pestañas de colores y fuentes se construyen la primera vez que se muestran.
+
+    def __init__(self, app):
+        self.app = app
+        self.settings = app.settings
+        self.color_previews = {}
+        self.font_var = None
+        self.font_list = None
+
+        self.window = ctk.CTkToplevel(app.root)
+        self.window.title("Ajustes")
+        self.window.geometry("600x700")
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        self.tabs = ctk.CTkTabview(self.window, command=self.on_tab_change)
+        self.tabs.pack(pady=20, padx=20, fill="both", expand=True)
+        self.builders = {
+            "Apariencia": self.build_appearance,
+            "Colores": self.build_colors,
+            "Fuentes": self.build_fonts
+        }
+        for name in self.builders:
+            self.tabs.add(name)
+        self.built = set()
+        self.on_tab_change()
+
+        # Botón para guardar
+        save_button = ctk.CTkButton(
+            self.window,
+            text="Guardar cambios",
+            command=self.save
+        )
+        save_button.pack(pady=(0, 20))
+
+    def font(self, size, *style):
+        return (self.settings["font_family"], size) + style
+
+    def on_tab_change(self):
+        name = self.tabs.get()
+        if name not in self.built:
+            self.built.add(name)
+            self.builders[name](self.tabs.tab(name))
+
+    def show(self):
+        self.sync()
+        self.window.deiconify()
+        self.window.lift()
+        self.window.grab_set()  # Hace la ventana modal
+
+    def hide(self):
+        self.window.grab_release()
+        self.window.withdraw()
+        if self.font_list is not None:
+            self.font_list.withdraw()
+
+    def sync(self):
+        # Refrescar los controles ya construidos con la configuración actual
+        self.theme_var.set(self.settings["theme"])
+        self.transparency_slider.set(self.settings.get("transparency", 0.95))
+        self.sync_colors()
+        if self.font_var is not None:
+            self.font_var.set(self.settings["font_family"])
+            self.font_preview.configure(font=(self.settings["font_family"], 14))
+            self.size_var.set(str(self.settings["font_size"]))
+
+    def sync_colors(self):
+        for color_key, preview in self.color_previews.items():
+            preview.configure(bg=self.settings["custom_colors"][color_key])
+
+    def save(self):
+        size = self.size_var.get() if self.font_var is not None else self.settings["font_size"]
+        self.app.save_visual_settings(size)
+
+    def build_appearance(self, frame):
+        # Tema
+        theme_label = ctk.CTkLabel(frame, text="Tema:", font=self.font(16))
+        theme_label.pack(pady=5)
+        self.theme_var = ctk.StringVar(value=self.settings["theme"])
+        theme_menu = ctk.CTkOptionMenu(
+            frame,
+            values=["dark", "light"],
+            variable=self.theme_var,
+            command=lambda x: self.app.change_theme(x)
+        )
+        theme_menu.pack(pady=5)
+
+        # Transparencia
+        transparency_frame = ctk.CTkFrame(frame)
+        transparency_frame.pack(pady=10, fill="x")
+
+        transparency_label = ctk.CTkLabel(
+            transparency_frame,
+            text="Transparencia:",
+            font=self.font(16)
+        )
+        transparency_label.pack(side="left", padx=10)
+
+        self.transparency_slider = ctk.CTkSlider(
+            transparency_frame,
+            from_=0.5,
+            to=1.0,
+            number_of_steps=50,
+            command=lambda x: self.app.change_transparency(x)
+        )
+        self.transparency_slider.set(self.settings.get("transparency", 0.95))
+        self.transparency_slider.pack(side="right", padx=10, fill="x", expand=True)
+
+    def build_colors(self, frame):
+        colors_label = ctk.CTkLabel(frame, text="Colores:", font=self.font(16))
+        colors_label.pack(pady=5)
+
+        # Frame para los botones de colores
+        colors_frame = ctk.CTkFrame(frame)
+        colors_frame.pack(pady=5, fill="x")
+
+        for color_name, color_key in COLOR_OPTIONS:
+            color_frame = ctk.CTkFrame(colors_frame)
+            color_frame.pack(pady=2, fill="x")
+
+            preview = tk.Label(
+                color_frame,
+                bg=self.settings["custom_colors"][color_key],
+                width=3,
+                height=1
+            )
+            preview.pack(side="left", padx=5, pady=5)
+            self.color_previews[color_key] = preview
+
+            label = ctk.CTkLabel(
+                color_frame,
+                text=color_name,
+                font=self.font(14)
+            )
+            label.pack(side="left", padx=5)
+
+            button = ctk.CTkButton(
+                color_frame,
+                text="Cambiar",
+                width=100,
+                command=lambda k=color_key: self.choose_color(k)
+            )
+            button.pack(side="right", padx=5)
+
+    def choose_color(self, color_key):
+        self.app.choose_color(color_key)
+        self.sync_colors()
+
+    def build_fonts(self, frame):
+        # Frame para la fuente
+        font_frame = ctk.CTkFrame(frame)
+        font_frame.pack(pady=10, fill="x")
+
+        font_label = ctk.CTkLabel(
+            font_frame,
+            text="Fuente:",
+            font=self.font(16)
+        )
+        font_label.pack(side="left", padx=10)
+
+        self.font_var = ctk.StringVar(value=self.settings["font_family"])
+        font_entry = ctk.CTkEntry(
+            font_frame,
+            textvariable=self.font_var,
+            width=200
+        )
+        font_entry.pack(side="left", padx=10)
+
+        font_button = ctk.CTkButton(
+            font_frame,
+            text="Buscar",
+            command=self.show_font_list,
+            width=100
+        )
+        font_button.pack(side="left", padx=10)
+
+        # Preview de la fuente
+        self.font_preview = ctk.CTkLabel(
+            font_frame,
+            text="Vista previa AaBbCc",
+            font=(self.font_var.get(), 14)
+        )
+        self.font_preview.pack(side="right", padx=10)
+
+        # Tamaño de fuente
+        size_frame = ctk.CTkFrame(frame)
+        size_frame.pack(pady=10, fill="x")
+
+        size_label = ctk.CTkLabel(size_frame, text="Tamaño:", font=self.font(16))
+        size_label.pack(side="left", padx=10)
+
+        self.size_var = ctk.StringVar(value=str(self.settings["font_size"]))
+        size_entry = ctk.CTkEntry(size_frame, width=50, textvariable=self.size_var)
+        size_entry.pack(side="left", padx=10)
+
+    def select_font(self, font_name):
+        self.font_var.set(font_name)
+        self.font_preview.configure(font=(font_name, 14))
+        self.app.change_font(font_name)
+
+    def show_font_list(self):
+        if self.font_list is None:
+            self.build_font_list()
+        self.search_var.set("")
+        self.update_filtered_list()
+        self.font_list.deiconify()
+        self.font_list.lift()
+        self.font_list.grab_set()  # Hacer la ventana modal
+
+    def hide_font_list(self):
+        self.font_list.grab_release()
+        self.font_list.withdraw()
+        self.window.grab_set()
+
+    def build_font_list(self):
+        # Ventana de selección de fuente, reutilizada entre aperturas
+        self.font_list = ctk.CTkToplevel(self.window)
+        self.font_list.title("Seleccionar Fuente")
+        self.font_list.geometry("400x600")
+        self.font_list.protocol("WM_DELETE_WINDOW", self.hide_font_list)
+
+        # Barra de búsqueda
+        search_frame = ctk.CTkFrame(self.font_list)
+        search_frame.pack(pady=10, padx=10, fill="x")
+
+        search_label = ctk.CTkLabel(
+            search_frame,
+            text="Buscar fuente:",
+            font=self.font(14)
+        )
+        search_label.pack(side="left", padx=5)
+
+        self.search_job = None
+        self.search_var = ctk.StringVar()
+        self.search_var.trace('w', lambda *args: self.schedule_search())
+
+        search_entry = ctk.CTkEntry(
+            search_frame,
+            textvariable=self.search_var,
+            width=200
+        )
+        search_entry.pack(side="left", padx=5, fill="x", expand=True)
+
+        # Lista virtualizada: las filas se reutilizan al desplazarse
+        self.list_frame = VirtualFontList(
+            self.font_list,
+            command=lambda f: [
+                self.select_font(f),
+                self.hide_font_list()
+            ]
+        )
+        self.list_frame.pack(pady=10, padx=10, fill="both", expand=True)
+
+    def schedule_search(self):
+        # Esperar a que el usuario deje de escribir antes de filtrar
+        if self.search_job is not None:
+            self.font_list.after_cancel(self.search_job)
+        self.search_job = self.font_list.after(150, self.update_filtered_list)
+
+    def update_filtered_list(self):
+        if self.search_job is not None:
+            self.font_list.after_cancel(self.search_job)
+            self.search_job = None
+        self.list_frame.set_items(self.app.get_font_index().search(self.search_var.get()))
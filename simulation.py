@@ -0,0 +1,237 @@
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from pomodoro_core import PomodoroSession, start_from_fields, reset_from_field
+from scheduler import TimerScheduler
+from session_log import apply_event, default_state
+from stats import StatsIndex
+from timer_loop import TimerLoop, tick_delay
+
+# Un tick puede llegar hasta 1 ms tarde por el redondeo de root.after (ms + 1)
+TOLERANCE = 0.0021
+
+
+class VirtualClock:
+    # Reloj simulado: el monotónico y el de pared avanzan juntos
+    def __init__(self, start=None):
+        self.start = start or datetime(2026, 1, 5, 8, 0)
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def wall(self):
+        return self.start + timedelta(seconds=self.now)
+
+
+class VirtualScheduler:
+    # Mismo contrato que root.after/after_idle/after_cancel, pero el tiempo
+    # sólo avanza con run_until(), saltando directo a la próxima fecha límite
+    def __init__(self, clock):
+        self.clock = clock
+        self.queue = TimerScheduler(clock.monotonic)
+        self.ids = 0
+        self.callbacks_run = 0
+
+    def after(self, ms, callback, *args):
+        self.ids += 1
+        job = f"after#{self.ids}"
+        self.queue.schedule(job, self.clock.now + ms / 1000, lambda: self._run(callback, args))
+        return job
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def after_cancel(self, job):
+        self.queue.cancel(job)
+
+    def _run(self, callback, args):
+        self.callbacks_run += 1
+        callback(*args)
+
+    def run_next(self):
+        # Avanza hasta el próximo callback programado y lo ejecuta
+        deadline = self.queue.next_deadline()
+        if deadline is not None:
+            self.run_until(deadline)
+
+    def run_until(self, until):
+        while True:
+            deadline = self.queue.next_deadline()
+            if deadline is None or deadline > until:
+                break
+            self.clock.now = max(self.clock.now, deadline)
+            self.queue.run_due(self.clock.now)
+        self.clock.now = max(self.clock.now, until)
+
+
+class Simulation:
+    # La lógica de tiempos de la app (PomodoroSession + TimerLoop) sobre un
+    # reloj y un programador virtuales, sin Tk. Los métodos hacen lo mismo que
+    # la interfaz (con las mismas funciones): editar los campos de duración,
+    # iniciar, pausar y reiniciar.
+    # Cada evento se verifica contra un modelo independiente del tiempo que
+    # la fase estuvo realmente corriendo.
+
+    def __init__(self, work_time=25, break_time=5, start=None, every_second=False):
+        self.every_second = every_second
+        self.clock = VirtualClock(start)
+        self.scheduler = VirtualScheduler(self.clock)
+        self.session = PomodoroSession(work_time, break_time,
+                                       clock=self.clock.monotonic, wall_clock=self.clock.wall)
+        self.loop = TimerLoop(self.session, self.scheduler, self.next_tick_delay)
+        # Lo mismo que guardaría el historial, con los mismos reductores
+        self.state = default_state()
+        self.stats = StatsIndex()
+        self.work_entry = str(work_time)
+        self.break_entry = str(break_time)
+        self.events = []
+        self.errors = []
+        self.invalid_inputs = 0
+        self.completed = {"work": 0, "break": 0}
+        self.ran = 0.0              # segundos que la fase actual estuvo corriendo
+        self.run_start = None
+        self.session.subscribe(self.on_event)
+
+    def next_tick_delay(self):
+        # Por defecto como la app con todas las ventanas ocultas; every_second
+        # recorre cada tick visible
+        return tick_delay(self.session, self.every_second)
+
+    # --- Acciones de la interfaz ---
+
+    def edit_durations(self, work=None, break_=None):
+        if work is not None:
+            self.work_entry = str(work)
+        if break_ is not None:
+            self.break_entry = str(break_)
+
+    def start_timer(self):
+        try:
+            start_from_fields(self.session, self.work_entry, self.break_entry)
+        except ValueError:
+            self.invalid_inputs += 1
+
+    def pause_timer(self):
+        self.session.pause()
+
+    def reset_timer(self):
+        try:
+            reset_from_field(self.session, self.work_entry)
+        except ValueError:
+            self.invalid_inputs += 1
+
+    def advance(self, seconds):
+        self.scheduler.run_until(self.clock.now + seconds)
+
+    def advance_to_phase_end(self, extra=0.0):
+        remaining = self.session.time_to_deadline()
+        if remaining is not None:
+            self.advance(remaining + extra)
+
+    # --- Verificación ---
+
+    def on_event(self, event):
+        now = self.clock.now
+        event = dict(event, t=now)
+        self.events.append(event)
+        apply_event(self.state, event)
+        self.stats.apply(event)
+        kind = event["type"]
+        if kind == "start":
+            self.run_start = now
+            self.loop.schedule()
+        elif kind == "pause":
+            self.ran += now - self.run_start
+            self.run_start = None
+        elif kind == "reset":
+            self.ran = 0.0
+            self.run_start = None
+        elif kind == "complete":
+            ran = self.ran + (now - self.run_start)
+            expected = event["minutes"] * 60
+            if not expected - 1e-6 <= ran <= expected + TOLERANCE:
+                self.fail(f"la fase {event['phase']} corrió {ran:.4f} s en lugar de {expected} s")
+            if event["ts"] != self.clock.wall().isoformat(timespec="seconds"):
+                self.fail(f"marca de tiempo {event['ts']} fuera de lugar")
+            self.completed[event["phase"]] += 1
+            self.ran = 0.0
+            self.run_start = now
+
+    def fail(self, message):
+        self.errors.append(f"t={self.clock.now:.3f}: {message}")
+
+    def verify(self):
+        sessions = self.completed["work"]
+        if self.session.sessions_completed != sessions:
+            self.fail(f"sessions_completed={self.session.sessions_completed}, se esperaban {sessions}")
+        total = sum(day["sessions"] for day in self.stats.days.values())
+        if total != sessions:
+            self.fail(f"las estadísticas cuentan {total} sesiones, se esperaban {sessions}")
+        day = self.state["day"]
+        if day and self.state["sessions_completed"] != self.stats.sessions_on(date.fromisoformat(day)):
+            self.fail(f"el conteo del día {day} no coincide con las estadísticas")
+        if self.errors:
+            raise AssertionError("\n".join(self.errors[:20]))
+
+
+def run_random(cycles=1000, seed=0, work_time=25, break_time=5, every_second=False):
+    # Escenario aleatorio pero reproducible: la mayoría de las fases corre
+    # hasta el final, y de vez en cuando se pausa, se reinicia o se editan
+    # los campos de duración (a veces con texto inválido)
+    rng = random.Random(seed)
+    sim = Simulation(work_time, break_time, every_second=every_second)
+    sim.start_timer()
+    while sim.completed["work"] < cycles:
+        roll = rng.random()
+        if not sim.session.is_running:
+            sim.advance(rng.uniform(0, 600))
+            sim.start_timer()
+            if not sim.session.is_running:
+                sim.edit_durations(rng.randint(1, 60), rng.randint(1, 30))
+        elif roll < 0.70:
+            sim.advance_to_phase_end(rng.uniform(0, 2))
+        elif roll < 0.85:
+            sim.advance(rng.uniform(0, sim.session.time_to_deadline()))
+            sim.pause_timer()
+        elif roll < 0.90:
+            sim.advance(rng.uniform(0, sim.session.time_to_deadline()))
+            sim.reset_timer()
+        elif roll < 0.98:
+            sim.edit_durations(rng.randint(1, 60), rng.randint(1, 30))
+        else:
+            sim.edit_durations(rng.choice(["", "abc", "2.5"]))
+    sim.verify()
+    return sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación de ciclos con reloj virtual")
+    parser.add_argument("--cycles", type=int, default=1000, help="sesiones de trabajo a completar")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work", type=int, default=25)
+    parser.add_argument("--break", dest="break_time", type=int, default=5)
+    parser.add_argument("--every-second", action="store_true",
+                        help="simular también cada tick de un segundo (mucho más lento)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        sim = run_random(args.cycles, args.seed, args.work, args.break_time, args.every_second)
+    except AssertionError as error:
+        print(f"La simulación falló:\n{error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    print(
+        f"{sim.completed['work']} sesiones de trabajo y {sim.completed['break']} descansos "
+        f"({len(sim.events)} eventos, {sim.invalid_inputs} entradas inválidas) en "
+        f"{timedelta(seconds=int(sim.clock.now))} simulados · {elapsed * 1000:.0f} ms reales"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
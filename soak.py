@@ -0,0 +1,93 @@
+import gc
+import sys
+import tracemalloc
+
+from simulation import VirtualClock, VirtualScheduler
+
+
+def virtual_time():
+    # Reloj y programador para crear la app de la prueba: cada ciclo salta
+    # directo a la fecha límite en lugar de esperarla
+    #   clock, scheduler = virtual_time()
+    #   PomodoroApp(clock=clock.monotonic, wall_clock=clock.wall, scheduler=scheduler)
+    clock = VirtualClock()
+    return clock, VirtualScheduler(clock)
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def pending_after_jobs(root):
+    try:
+        return len(root.tk.splitlist(root.tk.call("after", "info")))
+    except AttributeError:
+        return len(getattr(root, "jobs", ()))
+
+
+def snapshot(app, cycle):
+    # El registro escribe en segundo plano cada segundo; la prueba corre mucho
+    # más rápido, así que se vuelca antes de medir para no contar su cola
+    app.history.log.flush()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "cycle": cycle,
+        "widgets": count_widgets(app.root),
+        "after_jobs": pending_after_jobs(app.root),
+        "theme_widgets": len(app.theme.widgets),
+        "render_widgets": len(app.view.applied),
+        "traced_kb": current // 1024,
+        "peak_kb": peak // 1024
+    }
+
+
+def run_soak(app, scheduler, cycles=2000, report_every=250, out=None):
+    # Simula miles de ciclos de trabajo/descanso en la app ya creada con el
+    # programador virtual `scheduler` (ver virtual_time): cada sesión de
+    # trabajo muestra la alerta de descanso, la ventana flotante se abre y se
+    # cierra, y se mide si los widgets o la memoria crecen.
+    out = out or sys.stdout
+    clock = scheduler.clock
+    app.session.start(work_time=1, break_time=1)
+    app.root.update()
+
+    tracemalloc.start()
+    baseline = None
+    samples = []
+    for cycle in range(1, cycles + 1):
+        for _ in range(2):  # fin del trabajo y fin del descanso
+            # El tick pendiente corre una sola vez, ya pasada la fecha límite
+            clock.now += app.session.time_to_deadline() + 0.001
+            scheduler.run_until(clock.now)
+            app.root.update()
+        app.toggle_float_window()
+        app.root.update()
+        app.toggle_float_window()
+        app.close_break_alert()
+        app.root.update()
+
+        if cycle == 1:
+            baseline = tracemalloc.take_snapshot()
+        if cycle % report_every == 0 or cycle == cycles:
+            sample = snapshot(app, cycle)
+            samples.append(sample)
+            print(
+                f"ciclo {cycle:>6}: {sample['widgets']} widgets · {sample['after_jobs']} after · "
+                f"{sample['theme_widgets']} en el tema · {sample['traced_kb']} KiB",
+                file=out
+            )
+
+    growth = tracemalloc.take_snapshot().compare_to(baseline, "lineno")[:5]
+    tracemalloc.stop()
+    print("Mayor crecimiento desde el primer ciclo:", file=out)
+    for stat in growth:
+        print(f"  {stat}", file=out)
+    first, last = samples[0], samples[-1]
+    return {
+        "cycles": cycles,
+        "samples": samples,
+        "widget_growth": last["widgets"] - first["widgets"],
+        "traced_growth_kb": last["traced_kb"] - first["traced_kb"],
+        "sessions_completed": app.sessions_completed
+    }
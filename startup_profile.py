@@ -0,0 +1,45 @@
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class StartupProfiler:
+    # Mide cuánto tarda cada etapa del arranque (--profile-startup)
+
+    def __init__(self, origin=None, clock=time.perf_counter):
+        self.clock = clock
+        self.origin = clock() if origin is None else origin
+        self.sections = []
+        self.marks = []
+
+    @contextmanager
+    def section(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.sections.append((name, self.clock() - start))
+
+    def mark(self, name):
+        # Tiempo transcurrido desde el inicio del proceso hasta este punto
+        self.marks.append((name, self.clock() - self.origin))
+
+    def report(self, file=None):
+        file = file or sys.stderr
+        width = max([len(name) for name, _ in self.sections + self.marks] + [10])
+        print("Perfil de arranque:", file=file)
+        for name, elapsed in self.sections:
+            print(f"  {name:<{width}}  {elapsed * 1000:8.1f} ms", file=file)
+        for name, elapsed in self.marks:
+            print(f"  {name:<{width}}  {elapsed * 1000:8.1f} ms desde el inicio", file=file)
+
+
+class NullProfiler:
+    def section(self, name):
+        return nullcontext()
+
+    def mark(self, name):
+        pass
+
+    def report(self, file=None):
+        pass
@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+
+from tasks import TaskRegistry
+
+
+def week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class StatsIndex:
+    # Totales acumulados por día, semana y materia (ver tasks.py). Se
+    # actualizan evento a evento cuando termina una sesión, así las consultas
+    # de la vista de estadísticas no necesitan recorrer el historial.
+
+    def __init__(self):
+        self.days = {}        # "YYYY-MM-DD" -> {"sessions": n, "minutes": m}
+        self.weeks = {}       # "YYYY-Www" -> minutos de enfoque
+        self.tasks = TaskRegistry()   # materias: IDs, minutos y uso reciente
+        self.last_active = None
+        self.streak = 0
+
+    def apply(self, event):
+        if event.get("phase") != "work":
+            return
+        if event.get("type") == "start":
+            self.tasks.started(event.get("subject") or "", event["ts"])
+            return
+        if event.get("type") != "complete":
+            return
+        day = date.fromisoformat(event["ts"][:10])
+        minutes = event.get("minutes", 0)
+
+        totals = self.days.setdefault(day.isoformat(), {"sessions": 0, "minutes": 0})
+        totals["sessions"] += 1
+        totals["minutes"] += minutes
+
+        key = week_key(day)
+        self.weeks[key] = self.weeks.get(key, 0) + minutes
+
+        self.tasks.completed(event.get("subject") or "", minutes, event["ts"])
+
+        # Racha de días consecutivos con al menos una sesión
+        last = date.fromisoformat(self.last_active) if self.last_active else None
+        if last is None or day > last:
+            self.streak = self.streak + 1 if last == day - timedelta(days=1) else 1
+            self.last_active = day.isoformat()
+
+    def sessions_on(self, day):
+        return self.days.get(day.isoformat(), {}).get("sessions", 0)
+
+    def minutes_on(self, day):
+        return self.days.get(day.isoformat(), {}).get("minutes", 0)
+
+    def minutes_in_week(self, day):
+        return self.weeks.get(week_key(day), 0)
+
+    def subject_minutes(self, subject):
+        return self.tasks.minutes(subject)
+
+    def current_streak(self, today):
+        # La racha sigue viva si la última sesión fue hoy o ayer
+        if self.last_active is None:
+            return 0
+        last = date.fromisoformat(self.last_active)
+        return self.streak if today - last <= timedelta(days=1) else 0
+
+    def active_days(self, today, window=30):
+        return sum(
+            1 for offset in range(window)
+            if (today - timedelta(days=offset)).isoformat() in self.days
+        )
+
+    def to_dict(self):
+        return {
+            "days": self.days,
+            "weeks": self.weeks,
+            "tasks": self.tasks.to_dict(),
+            "last_active": self.last_active,
+            "streak": self.streak
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls()
+        if data:
+            index.days = data.get("days", {})
+            index.weeks = data.get("weeks", {})
+            if "tasks" in data:
+                index.tasks = TaskRegistry.from_dict(data["tasks"])
+            else:
+                index.tasks = TaskRegistry.from_subjects(data.get("subjects", {}))
+            index.last_active = data.get("last_active")
+            index.streak = data.get("streak", 0)
+        return index
@@ -0,0 +1,146 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from datetime import datetime
+from itertools import islice
+
+# Cada cuántos segundos se reduce a la mitad el peso de un uso (14 días)
+HALF_LIFE = 14 * 24 * 3600
+# Las sugerencias también coinciden con el comienzo de cada palabra
+# ("123" encuentra "JIRA-123 login")
+WORD_START = re.compile(r"(?:^|(?<=[\s\-_/:#.]))\S")
+
+
+def normalize(name):
+    return " ".join(name.split())
+
+
+def timestamp(ts):
+    return datetime.fromisoformat(ts).timestamp()
+
+
+class Task:
+    __slots__ = ("id", "name", "sessions", "minutes", "score", "at", "last_used")
+
+    def __init__(self, task_id, name):
+        self.id = task_id
+        self.name = name
+        self.sessions = 0
+        self.minutes = 0
+        self.score = 0.0          # usos con decaimiento, valuados en `at`
+        self.at = 0.0
+        self.last_used = 0.0
+
+    def rank(self):
+        # log2(score) + at / HALF_LIFE ordena igual que el puntaje decaído a
+        # cualquier fecha común, sin tener que recalcularlo para cada tarea
+        frecency = math.log2(self.score) + self.at / HALF_LIFE if self.score else -math.inf
+        return frecency, self.last_used
+
+    def use(self, when):
+        if self.score:
+            self.score *= 2 ** (-max(0.0, when - self.at) / HALF_LIFE)
+        self.score += 1.0
+        self.at = max(self.at, when)
+
+
+class TaskRegistry:
+    # Registro de materias/tickets. Cada texto distinto se guarda una sola vez
+    # con un ID compacto (su posición en `tasks`), junto con las sesiones y
+    # los minutos dedicados. Un índice ordenado de claves en minúsculas
+    # (el nombre desde el comienzo de cada palabra) responde las búsquedas
+    # por prefijo con bisect, sin recorrer el historial.
+
+    def __init__(self):
+        self.tasks = []           # ID -> Task
+        self.ids = {}             # nombre -> ID
+        self._index = []          # [(clave, ID)] ordenado
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def intern(self, name):
+        # Devuelve el ID del nombre (None si está vacío), creándolo si no existe
+        name = normalize(name)
+        if not name:
+            return None
+        task_id = self.ids.get(name)
+        if task_id is None:
+            task_id = self.ids[name] = len(self.tasks)
+            self.tasks.append(Task(task_id, name))
+            folded = name.casefold()
+            for match in WORD_START.finditer(folded):
+                insort(self._index, (folded[match.start():], task_id))
+        return task_id
+
+    def get(self, name):
+        task_id = self.ids.get(normalize(name))
+        return None if task_id is None else self.tasks[task_id]
+
+    def started(self, name, ts):
+        task_id = self.intern(name)
+        if task_id is not None:
+            task = self.tasks[task_id]
+            task.last_used = max(task.last_used, timestamp(ts))
+        return task_id
+
+    def completed(self, name, minutes, ts):
+        task_id = self.intern(name)
+        if task_id is not None:
+            task = self.tasks[task_id]
+            when = timestamp(ts)
+            task.sessions += 1
+            task.minutes += minutes
+            task.use(when)
+            task.last_used = max(task.last_used, when)
+        return task_id
+
+    def minutes(self, name):
+        task = self.get(name)
+        return task.minutes if task else 0
+
+    def complete(self, prefix, limit=5):
+        # Nombres que empiezan (en alguna palabra) con `prefix`, los más
+        # usados y recientes primero
+        prefix = normalize(prefix).casefold()
+        if not prefix:
+            return [task.name for task in heapq.nlargest(limit, self.tasks, key=Task.rank)]
+        matches = set()
+        start = bisect_left(self._index, (prefix,))
+        for key, task_id in islice(self._index, start, None):
+            if not key.startswith(prefix):
+                break
+            matches.add(task_id)
+        best = heapq.nlargest(limit, (self.tasks[task_id] for task_id in matches), key=Task.rank)
+        return [task.name for task in best]
+
+    def to_dict(self):
+        return {
+            "entries": [
+                [task.name, task.sessions, task.minutes, task.score, task.at, task.last_used]
+                for task in self.tasks
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        registry = cls()
+        for name, sessions, minutes, score, at, last_used in (data or {}).get("entries", []):
+            task = registry.tasks[registry.intern(name)]
+            task.sessions, task.minutes = sessions, minutes
+            task.score, task.at, task.last_used = score, at, last_used
+        return registry
+
+    @classmethod
+    def from_subjects(cls, subjects):
+        # Snapshots anteriores: sólo totales por nombre, sin fechas de uso
+        registry = cls()
+        for name, totals in subjects.items():
+            task_id = registry.intern(name)
+            if task_id is not None:
+                task = registry.tasks[task_id]
+                task.sessions += totals.get("sessions", 0)
+                task.minutes += totals.get("minutes", 0)
+                task.score = float(task.sessions)
+        return registry
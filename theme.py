@@ -0,0 +1,71 @@
+import tkinter as tk
+
+# Cada estilo indica qué rol de custom_colors usa cada opción del widget.
+# Los valores que no son un rol (como "transparent") se aplican tal cual.
+STYLES = {
+    "root": {"fg_color": "primary"},
+    "frame": {"fg_color": "secondary", "bg_color": "primary"},
+    "label": {"text_color": "text", "fg_color": "transparent"},
+    "countdown": {"text_color": "text", "fg_color": "secondary"},
+    "button": {"fg_color": "accent", "text_color": "primary", "hover_color": "text"},
+    "entry": {"fg_color": "text", "text_color": "primary", "border_color": "accent"},
+    "alert": {"fg_color": "warning"},
+    "toast": {"fg_color": "secondary", "border_color": "accent"},
+    "toast_warning": {"fg_color": "warning", "border_color": "text"},
+    "suggestion": {"fg_color": "secondary", "text_color": "text", "hover_color": "primary"}
+}
+
+PALETTE_CACHE_SIZE = 16
+
+
+def build_palette(colors):
+    return {
+        style: {option: colors.get(role, role) for option, role in options.items()}
+        for style, options in STYLES.items()
+    }
+
+
+class ThemeRegistry:
+    # Registro de widgets por estilo. Las paletas se precalculan una vez por
+    # combinación de colores y un cambio de tema se aplica a todos los widgets
+    # registrados en un único lote diferido (after_idle).
+
+    def __init__(self, root, colors):
+        self.root = root
+        self.colors = dict(colors)
+        self.widgets = {}
+        self.palettes = {}
+        self.flush_id = None
+        self.configure_calls = 0
+
+    def palette(self, colors=None):
+        colors = self.colors if colors is None else colors
+        key = tuple(sorted(colors.items()))
+        palette = self.palettes.get(key)
+        if palette is None:
+            if len(self.palettes) >= PALETTE_CACHE_SIZE:
+                self.palettes.pop(next(iter(self.palettes)))
+            palette = self.palettes[key] = build_palette(colors)
+        return palette
+
+    def register(self, widget, style):
+        self.widgets[widget] = style
+
+    def unregister(self, widget):
+        self.widgets.pop(widget, None)
+
+    def apply(self, colors):
+        self.colors = dict(colors)
+        if self.flush_id is None:
+            self.flush_id = self.root.after_idle(self.flush)
+
+    def flush(self):
+        self.flush_id = None
+        palette = self.palette()
+        for widget, style in list(self.widgets.items()):
+            try:
+                widget.configure(**palette[style])
+                self.configure_calls += 1
+            except tk.TclError:
+                # La ventana del widget ya se cerró
+                self.unregister(widget)
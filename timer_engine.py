@@ -0,0 +1,90 @@
+import math
+import time
+
+
+class TimerEngine:
+    # Cuenta regresiva basada en un reloj monotónico: en lugar de restar un
+    # segundo en cada tick se guarda la fecha límite y el tiempo restante se
+    # calcula al consultarlo, así los retrasos del bucle de eventos no se acumulan.
+
+    def __init__(self, duration=0, clock=time.monotonic, on_tick=None, on_finish=None):
+        self.clock = clock
+        self.on_tick = on_tick
+        self.on_finish = on_finish
+        self.duration = duration
+        self._remaining = float(duration)   # Tiempo restante mientras está en pausa
+        self._deadline = None               # Fecha límite (reloj monotónico) si está corriendo
+        self._last_shown = self.seconds_left()
+
+    @property
+    def is_running(self):
+        return self._deadline is not None
+
+    @property
+    def deadline(self):
+        # Fecha límite en el reloj del motor (None si está en pausa)
+        return self._deadline
+
+    def remaining(self):
+        if self._deadline is None:
+            return self._remaining
+        return max(0.0, self._deadline - self.clock())
+
+    def seconds_left(self):
+        # Segundo que se muestra en pantalla (redondeado hacia arriba: 00:01
+        # se ve hasta que realmente llega a cero)
+        return int(math.ceil(self.remaining() - 1e-9))
+
+    def set_remaining(self, seconds):
+        if self._deadline is None:
+            self._remaining = float(max(0, seconds))
+        else:
+            self._deadline = self.clock() + max(0, seconds)
+        self._notify_if_changed()
+
+    def start(self):
+        if self._deadline is None:
+            self._deadline = self.clock() + self._remaining
+
+    def pause(self):
+        if self._deadline is not None:
+            self._remaining = self.remaining()
+            self._deadline = None
+
+    def reset(self, duration=None):
+        if duration is not None:
+            self.duration = duration
+        self._deadline = None
+        self._remaining = float(self.duration)
+        self._notify_if_changed()
+
+    def time_to_next_change(self):
+        # Segundos hasta que cambie el valor mostrado (para programar el próximo tick)
+        if self._deadline is None:
+            return None
+        remaining = self.remaining()
+        if remaining <= 0:
+            return 0.0
+        fraction = remaining - math.floor(remaining)
+        return fraction if fraction > 1e-6 else 1.0
+
+    def poll(self):
+        # Recalcula el tiempo restante y avisa sólo si el segundo mostrado cambió.
+        # Devuelve True cuando la cuenta regresiva terminó en esta llamada.
+        if self._deadline is None:
+            return False
+        self._notify_if_changed()
+        if self.remaining() <= 0:
+            self._deadline = None
+            self._remaining = 0.0
+            if self.on_finish:
+                self.on_finish()
+            return True
+        return False
+
+    def _notify_if_changed(self):
+        shown = self.seconds_left()
+        if shown != self._last_shown:
+            self._last_shown = shown
+            if self.on_tick:
+                self.on_tick(shown)
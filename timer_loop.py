@@ -0,0 +1,61 @@
+from diagnostics import Diagnostics
+
+# Con todas las ventanas ocultas o minimizadas el temporizador sólo despierta
+# en la próxima fecha límite de fase o, como mucho, cada este número de segundos
+HIDDEN_CHECK_IN = 60
+
+
+def tick_delay(session, visible, hidden_check_in=HIDDEN_CHECK_IN):
+    # Si alguien ve el temporizador, un tick por cada segundo mostrado. Si no,
+    # dormir hasta el cambio de fase (para que la alerta y el conteo de
+    # sesiones lleguen a tiempo) o hasta el control periódico
+    delay = session.time_to_next_change()
+    if delay is None or visible:
+        return delay
+    deadline = session.time_to_deadline()
+    hidden_delay = hidden_check_in if deadline is None else min(deadline, hidden_check_in)
+    return max(delay, hidden_delay)
+
+
+class TimerLoop:
+    # Bucle de ticks del temporizador. El programador es cualquier objeto con
+    # after/after_idle/after_cancel: la ventana de Tk en la app, o uno
+    # virtual en las simulaciones (ver simulation.py). El próximo tick se
+    # programa justo cuando cambia el segundo mostrado, o con la demora que
+    # indique `delay` (p. ej. más larga si no hay ventanas visibles).
+
+    def __init__(self, session, scheduler, delay=None, diagnostics=None):
+        self.session = session
+        self.scheduler = scheduler
+        self.delay = delay or session.time_to_next_change
+        self.diagnostics = diagnostics or Diagnostics()
+        self.timer_id = None
+
+    def tick(self):
+        self.timer_id = None
+        self.diagnostics.tick_fired()
+        with self.diagnostics.measure("update_timer"):
+            self.session.poll()
+        # Un cambio de fase durante poll() ya programó el próximo tick
+        delay = self.delay()
+        if delay is not None and self.timer_id is None:
+            delay_ms = int(delay * 1000) + 1
+            self.diagnostics.tick_scheduled(delay_ms / 1000)
+            self.timer_id = self.scheduler.after(delay_ms, self.tick)
+
+    def schedule(self):
+        # Tick inmediato. Un tick pendiente se reemplaza: tras un reinicio o
+        # una edición de tiempos, su fecha podría ser posterior al nuevo final
+        self.cancel()
+        self.diagnostics.tick_scheduled(0)
+        self.timer_id = self.scheduler.after_idle(self.tick)
+
+    def cancel(self):
+        if self.timer_id is not None:
+            self.scheduler.after_cancel(self.timer_id)
+            self.timer_id = None
+
+    def wake(self):
+        # Reemplazar un tick lejano por uno inmediato
+        if self.timer_id is not None:
+            self.schedule()